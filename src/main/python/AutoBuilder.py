@@ -0,0 +1,121 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Mutable automaton, frozen into an Automata.Auto once built.
+# Auto.AddState looks for the state in the states Seq (a linear scan), and
+# AddState/AddEdge copy the transition Maps and the successor Seqs, so
+# building an automaton is quadratic.
+# AutoBuilder indexes the states with a dict, keeps the successors and
+# predecessors in lists, and checks duplicate edges with a set per node.
+# The states, indices and edges are the same as with Auto.AddState/AddEdge.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import Automata
+
+# Module: AutoBuilder
+
+class AutoBuilder:
+    """
+    An automaton being built. The states are numbered in the order they
+    are added; succs[k] (resp. preds[k]) are the successors (resp.
+    predecessors) of state k in the order the edges are added.
+    """
+    def  __init__(self):
+        self.states = []
+        self.indexOf = {}
+        self.succs = []
+        self.preds = []
+        self.edges = []
+
+    def __contains__(self, s):
+        return s in self.indexOf
+
+    def AddState(self, s):
+        """
+        The index of s, added if it is not a state yet.
+        """
+        k = self.indexOf.get(s)
+        if k is None:
+            k = len(self.states)
+            self.indexOf[s] = k
+            self.states.append(s)
+            self.succs.append([])
+            self.preds.append([])
+            self.edges.append(set())
+        return k
+
+    def AddEdge(self, s, t):
+        k = self.AddState(s)
+        l = self.AddState(t)
+        if l not in self.edges[k]:
+            self.edges[k].add(l)
+            self.succs[k].append(l)
+            self.preds[l].append(k)
+
+    def Enter(self, s):
+        """
+        Called by Explorer.Explore when the exploration of s starts.
+        """
+        pass
+
+    def Leave(self, s):
+        """
+        Called by Explorer.Explore when the exploration of s ends.
+        """
+        pass
+
+    def IndexOf(self, s):
+        return self.indexOf.get(s)
+
+    def SSize(self):
+        return len(self.states)
+
+    def TSize(self):
+        return sum(len(x) for x in self.succs)
+
+    def SuccNat(self, k):
+        return self.succs[k]
+
+    def PredNat(self, k):
+        return self.preds[k]
+
+    def Freeze(self):
+        """
+        The Automata.Auto with the same states and edges.
+        """
+        Seq = _dafny.SeqWithoutIsStrInference
+        return Automata.Auto_Auto(
+            _dafny.Map({k: Seq(x) for k, x in enumerate(self.succs)}),
+            _dafny.Map({k: Seq(x) for k, x in enumerate(self.preds)}),
+            Seq(self.states),
+            _dafny.Map(self.indexOf))
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def FromAuto(a):
+        """
+        A builder with the states and edges of a.
+        """
+        b = AutoBuilder()
+        b.states = list(a.states)
+        b.indexOf = dict(dict.items(a.indexOf))
+        b.succs = [list(a.SuccNat(k)) for k in range(a.SSize())]
+        b.preds = [list(a.PredNat(k)) for k in range(a.SSize())]
+        b.edges = [set(x) for x in b.succs]
+        return b
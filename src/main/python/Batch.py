@@ -0,0 +1,276 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Batch mode: analyse a corpus of contracts with a pool of worker processes.
+# The input is a directory (one contract per file, the id is the file name),
+# a JSONL file or a CSV file of records with an id and a bytecode field.
+# Each worker imports the generated modules once and processes many
+# contracts. Each contract has a wall-clock limit (--timeout) and a memory
+# limit (--max-rss-mb), and workers are replaced after --recycle contracts.
+# The limits stop the CFG exploration through its Explorer.Budget: the
+# alarm of the timeout only stops the budget, which the exploration polls,
+# and the other steps check it in between, so that the memo tables and the
+# cache are never left half updated.
+# One JSON object per contract is written to the output as soon as it is
+# available.
+# This file is copied into the output of the Dafny python generator.
+# Usage: python3 build/libs/driver-py/Batch.py [options] <dir | file.jsonl | file.csv> -o results.jsonl
+import sys
+import os
+import csv
+import json
+import time
+import signal
+import resource
+import argparse
+import multiprocessing
+
+import module_
+import _dafny
+import System_
+import InputReader
+import InstructionStore
+import CFGObject
+import Dot
+import Sink
+import ResultCache
+import Checkpoint
+import evmdis
+import SegmentMemo
+import Explorer
+import Patches
+
+# Module: Batch
+
+class Timeout(Exception):
+    pass
+
+# The result cache of the worker, if any.
+CACHE = None
+
+# The budget of the contract being processed.
+BUDGET = None
+
+def OnAlarm(signum, frame):
+    if BUDGET is not None:
+        BUDGET.Stop("timeout")
+
+def Check(budget):
+    """
+    Raise Timeout if the time of the contract is over.
+    """
+    if budget.hit == "timeout":
+        raise Timeout()
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Records(path, binary):
+        """
+        The records (id, kind, payload) of the corpus at path.
+        kind is "file" (payload is a path) or "hex" (payload is the bytecode).
+        """
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                f = os.path.join(path, name)
+                if os.path.isfile(f):
+                    yield name, "file", f
+        elif path.endswith(".csv"):
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    yield row["id"], "hex", row.get("bytecode") or row.get("code", "")
+        else:
+            with open(path) as f:
+                for n, line in enumerate(f):
+                    if line.strip():
+                        r = json.loads(line)
+                        yield str(r.get("id", n)), "hex", r.get("bytecode") or r.get("code", "")
+
+    @staticmethod
+    def Init(cache, cacheMb):
+        """
+        Worker initialisation: shared opcode tables, result cache and timeouts.
+        """
+        global CACHE
+        Patches.default__.InstallAll()
+        if cache is not None:
+            CACHE = ResultCache.ResultCache(cache, cacheMb * 1024 * 1024)
+        signal.signal(signal.SIGALRM, OnAlarm)
+
+    @staticmethod
+    def Analyse(rid, code, opts, budget):
+        """
+        Disassemble code, build its CFG within budget and collect the
+        results in a dict.
+        """
+        r = {}
+        store = InstructionStore.default__.Build(code)
+        prog = store.EVMObj()
+        Check(budget)
+        r["bytes"] = len(store.code)
+        r["instructions"] = len(store)
+        r["segments"] = len(prog.xs)
+        if opts.cfg > 0 and len(prog.xs) > 0 and prog.xs[0].StartAddress() == 0:
+            key = ResultCache.default__.Key(bytes(store.code), opts.cfg, not opts.raw, opts.notable, False, opts.abstract_stacks)
+            hits = CACHE.hits if CACHE is not None else 0
+            checkpoint = None
+            if opts.checkpoint_dir is not None:
+                path = os.path.join(opts.checkpoint_dir, rid.replace(os.sep, "_") + ".ckpt")
+                checkpoint = Checkpoint.Checkpoint(path, Checkpoint.default__.Key(bytes(store.code), opts.cfg, not opts.raw, opts.abstract_stacks, opts.reduce), opts.checkpoint_seconds)
+            entry = ResultCache.default__.Entry(CACHE, key, prog, lambda: evmdis.BuildCFG(prog, opts.cfg, not opts.raw, opts.abstract_stacks,
+                1, budget, checkpoint, opts.reduce), checkpoint is None)
+            a, stats = entry["auto"], entry["stats"]
+            Check(budget)
+            if CACHE is not None:
+                r["cache"] = "hit" if CACHE.hits > hits else "miss"
+            r["states"] = a.SSize()
+            r["transitions"] = a.TSize(0)
+            r["maxDepthReached"] = stats.maxDepthReached
+            r["visitedStates"] = stats.visitedStates
+            r["wPreInvSuccess"] = stats.wPreInvSuccess
+            r["errorStates"] = stats.errorState
+            r["nonMinimisedSize"] = list(stats.nonMinimisedSize)
+            r["loopHits"] = stats.loopHits
+            r["loopMisses"] = stats.loopMisses
+            if opts.abstract_stacks:
+                r["mergedStates"] = stats.mergedStates
+            if stats.budget is not None:
+                r["budget"] = stats.budget
+            if opts.dot_dir is not None:
+                dot = os.path.join(opts.dot_dir, rid.replace(os.sep, "_") + (".dot.gz" if opts.gzip else ".dot"))
+                cfgObj = CFGObject.CFGObj_CFGObj(prog, opts.cfg, a, not opts.raw, stats)
+                def Render():
+                    # The stack size fixpoint, with its number of updates (see WPreFix).
+                    wPre = cfgObj.computeWpre()
+                    Check(budget)
+                    if wPre.is_Some:
+                        r["wpreUpdates"] = wPre.v.updates
+                    return Dot.default__.Lines(cfgObj, opts.notable, ToSeq(rid), wPre)
+                with Sink.default__.Open(dot, opts.gzip) as f:
+                    f.write(ResultCache.default__.Render(CACHE, key, entry, ("dot", rid), Render))
+                r["dot"] = dot
+        return r
+
+    @staticmethod
+    def Work(job):
+        """
+        Process one record in a worker. Never raises.
+        """
+        global BUDGET
+        (rid, kind, payload), opts = job
+        r = {"id": rid, "status": "ok"}
+        start = time.perf_counter()
+        hits, misses = SegmentMemo.default__.Counts()
+        BUDGET = Explorer.Budget(opts.max_states, opts.max_seconds, opts.max_rss_mb)
+        if opts.timeout > 0:
+            signal.setitimer(signal.ITIMER_REAL, opts.timeout)
+        try:
+            if kind == "file":
+                code = InputReader.default__.ReadFile(payload, opts.binary)
+            else:
+                code = InputReader.default__.ReadString(payload)
+            if code.is_Failure:
+                r["status"] = "error"
+                r["error"] = code.msg.VerbatimString(False).strip()
+            else:
+                r.update(default__.Analyse(rid, code.v, opts, BUDGET))
+        except Timeout:
+            r["status"] = "timeout"
+        except MemoryError:
+            r["status"] = "memory"
+        except RecursionError:
+            r["status"] = "error"
+            r["error"] = "recursion depth exceeded"
+        except Exception as e:
+            r["status"] = "error"
+            r["error"] = type(e).__name__ + ": " + str(e)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            BUDGET = None
+        h, m = SegmentMemo.default__.Counts()
+        r["memoHits"], r["memoMisses"] = h - hits, m - misses
+        r["seconds"] = round(time.perf_counter() - start, 6)
+        r["maxRssKb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return r
+
+    @staticmethod
+    def Run(opts):
+        """
+        Process all the records of opts.input and write the results to opts.output.
+        Returns the number of records per status.
+        """
+        counts = {}
+        if opts.dot_dir is not None:
+            os.makedirs(opts.dot_dir, exist_ok=True)
+        if opts.checkpoint_dir is not None:
+            os.makedirs(opts.checkpoint_dir, exist_ok=True)
+        jobs = ((rec, opts) for rec in default__.Records(opts.input, opts.binary))
+        out = sys.stdout if opts.output == "-" else open(opts.output, "w")
+        try:
+            with multiprocessing.Pool(opts.jobs, default__.Init, (opts.cache, opts.cache_mb), opts.recycle or None) as pool:
+                for r in pool.imap_unordered(default__.Work, jobs):
+                    out.write(json.dumps(r) + "\n")
+                    out.flush()
+                    counts[r["status"]] = counts.get(r["status"], 0) + 1
+                    if "budget" in r:
+                        counts["budget-" + r["budget"]] = counts.get("budget-" + r["budget"], 0) + 1
+                    if "cache" in r:
+                        counts["cache-" + r["cache"]] = counts.get("cache-" + r["cache"], 0) + 1
+                    counts["memoHits"] = counts.get("memoHits", 0) + r["memoHits"]
+                    counts["memoMisses"] = counts.get("memoMisses", 0) + r["memoMisses"]
+                    counts["loopHits"] = counts.get("loopHits", 0) + r.get("loopHits", 0)
+                    counts["loopMisses"] = counts.get("loopMisses", 0) + r.get("loopMisses", 0)
+                    counts["wpreUpdates"] = counts.get("wpreUpdates", 0) + r.get("wpreUpdates", 0)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return counts
+
+def Options(argv):
+    parser = argparse.ArgumentParser(prog="evmdis-batch", description="Analyse a corpus of EVM contracts")
+    parser.add_argument("input", help="A directory, a JSONL file or a CSV file of (id, bytecode) records")
+    parser.add_argument("-o", "--output", default="-", help="The output JSONL file (default stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("-c", "--cfg", type=int, default=0, help="Max depth. Build the control flow graph")
+    parser.add_argument("-r", "--raw", action="store_true", help="Do not minimise the CFGs")
+    parser.add_argument("-n", "--notable", action="store_true", help="Don't use tables to pretty-print DOT files")
+    parser.add_argument("-b", "--binary", action="store_true", help="The files in the input directory are raw bytes, not hex")
+    parser.add_argument("--abstract-stacks", action="store_true", help="Merge the states whose stacks only differ by values that are never jump targets")
+    parser.add_argument("--dot-dir", help="Write the CFG of each contract to DIR/<id>.dot")
+    parser.add_argument("--gzip", action="store_true", help="Compress the DOT files (DIR/<id>.dot.gz)")
+    parser.add_argument("--timeout", type=float, default=0, help="Wall-clock limit per contract in seconds")
+    parser.add_argument("--max-rss-mb", type=int, default=0, help="Stop the CFG exploration when the worker uses this much memory (partial CFG)")
+    parser.add_argument("--max-states", type=int, default=0, help="Stop the CFG exploration after this many states (partial CFG)")
+    parser.add_argument("--max-seconds", type=float, default=0, help="Stop the CFG exploration after this many seconds (partial CFG)")
+    parser.add_argument("--reduce", action="store_true", help="Minimise the CFG during the exploration (same CFG)")
+    parser.add_argument("--checkpoint-dir", help="Resume the CFG explorations from and save them to DIR/<id>.ckpt")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60, help="Save the checkpoints every this many seconds (0: at the end only)")
+    parser.add_argument("--cache", metavar="FILE", help="Cache the CFGs in the SQLite file FILE")
+    parser.add_argument("--cache-mb", type=int, default=256, help="Max size of the cache in MB")
+    parser.add_argument("--recycle", type=int, default=100, help="Replace a worker after this many contracts (0: never)")
+    opts = parser.parse_args(argv)
+    if opts.reduce and opts.checkpoint_dir is not None:
+        parser.error("--reduce and --checkpoint-dir are exclusive")
+    if opts.reduce and opts.raw:
+        parser.error("--reduce builds the minimised CFGs only, not with --raw")
+    return opts
+
+if __name__ == "__main__":
+    counts = default__.Run(Options(sys.argv[1:]))
+    print(json.dumps(counts), file=sys.stderr)
@@ -0,0 +1,141 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Linear-time disassembler working on bytes.
+# BinaryDecoder.Disassemble re-slices the input Seq at every instruction and
+# is quadratic in the size of the code. This module decodes the hex string
+# once (bytes.fromhex) and walks the buffer with a moving cursor.
+# It produces the same sequence of Instructions.Instruction as
+# BinaryDecoder.Disassemble, including the INVALID instructions that end
+# a malformed input.
+# This file is copied into the output of the Dafny python generator.
+import sys
+import re
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import EVMConstants
+import OpcodeTable
+import Instructions
+
+# Module: ByteDisassembler
+
+ARGS = OpcodeTable.ARGS
+OPCODES = OpcodeTable.OPCODES
+
+NOT_HEX = re.compile(r'[^0-9a-fA-F]')
+
+EMPTY_ARG = _dafny.SeqWithoutIsStrInference([])
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def FromHex(s):
+        """
+        Decode the longest valid prefix of the hex string s.
+        Returns the bytes and the number of characters of s that are not
+        part of a decoded byte (odd last character, non-hex characters).
+        """
+        m = NOT_HEX.search(s)
+        k = len(s) if m is None else m.start()
+        return bytes.fromhex(s[:k - k % 2]), len(s) - (k - k % 2)
+
+    @staticmethod
+    def Walk(buf, n):
+        """
+        Yield (pc, opcode, end) for each complete instruction in buf[:n].
+        The immediate of a PUSH is buf[pc + 1:end].
+        Stops before the first PUSH whose immediate does not fit in buf[:n].
+        """
+        args = ARGS
+        pc = 0
+        while pc < n:
+            op = buf[pc]
+            end = pc + 1 + args[op]
+            if end > n:
+                return
+            yield pc, op, end
+            pc = end
+
+    @staticmethod
+    def TailError(s, buf, pc):
+        """
+        The argument of the INVALID instruction that ends the disassembly of
+        s at pc, or None if the input is well-formed.
+        s is the original hex string or None if the input is raw bytes.
+        """
+        n = len(buf)
+        if pc < n:
+            return ToSeq("not enough arguments for opcode ") + OPCODES[buf[pc]].name
+        if s is None or len(s) == 2 * n:
+            return None
+        if len(s) - 2 * n == 1:
+            return ToSeq("Odd number of characters ending in " + s[2 * n:])
+        return ToSeq("'" + s[2 * n:2 * n + 2] + "' is not an Hex number")
+
+    @staticmethod
+    def Scan(code):
+        """
+        Iterate over the instructions of code (bytes, bytearray, memoryview or hex string).
+        Yields (address, opcode, immediate) with immediate a native int for
+        PUSH1..PUSH32 and None otherwise.
+        A malformed tail yields (address, INVALID, message) where message is a str
+        and stops the iteration.
+        """
+        s = None
+        if isinstance(code, str):
+            s = code
+            code, _ = default__.FromHex(s)
+        buf = memoryview(code).cast('B') if not isinstance(code, bytes) else code
+        n = len(buf)
+        pc = 0
+        for pc, op, end in default__.Walk(buf, n):
+            yield pc, op, (int.from_bytes(buf[pc + 1:end], 'big') if end > pc + 1 else None)
+            pc = end
+        err = default__.TailError(s, buf, pc)
+        if err is not None:
+            yield pc, EVMConstants.default__.INVALID, err.VerbatimString(False)
+
+    @staticmethod
+    def Disassemble(code):
+        """
+        Disassemble code (bytes, bytearray, memoryview or hex string without 0x).
+        Same result as BinaryDecoder.Disassemble(code, [], 0) for a hex string,
+        and BinaryDecoder.DisassembleU8 for bytes.
+        Hex strings keep the case of the PUSH arguments, bytes produce lowercase.
+        """
+        s = code if isinstance(code, str) else None
+        ops = OPCODES
+        p = []
+        for pc, op, imm in default__.Scan(code):
+            if imm is None:
+                arg = EMPTY_ARG
+            elif isinstance(imm, str):
+                # The malformed tail.
+                arg = ToSeq(imm)
+            elif s is not None:
+                arg = ToSeq(s[2 * pc + 2:2 * (pc + 1 + ARGS[op])])
+            else:
+                arg = ToSeq("%0*x" % (2 * ARGS[op], imm))
+            p.append(Instructions.Instruction_Instruction(ops[op], arg, pc))
+        return _dafny.SeqWithoutIsStrInference(p)
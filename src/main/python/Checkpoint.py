@@ -0,0 +1,139 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Checkpoints of the CFG exploration.
+# A checkpoint file holds the automaton built so far (not minimised), the
+# stats and the frontier of the exploration (see Explorer.Explore): the
+# nodes cut at max depth and the nodes that were being explored when the
+# exploration stopped. It is written every interval seconds during the
+# exploration and at the end.
+# BuildCFG resumes from the checkpoint if there is one: it only explores
+# the frontier (the nodes cut at max depth stay in the frontier). A run
+# stopped by a budget or killed can be resumed, with the same options (they
+# are in the key of the checkpoint), and gives the same CFG as a run that
+# is not stopped.
+# This file is copied into the output of the Dafny python generator.
+import os
+import time
+import hashlib
+
+import module_
+import _dafny
+import System_
+import CFGState
+import Statistics
+import EVMObject
+import AutoBuilder
+import Explorer
+import StackAbstraction
+import Pickling
+
+# Module: Checkpoint
+
+class Mismatch(Exception):
+    pass
+
+class Checkpoint:
+    """
+    The checkpoint file path of the exploration of the program with the
+    given key, saved every interval seconds (0 is only at the end).
+    """
+    # The time is checked every CHECK steps.
+    CHECK = 256
+
+    def  __init__(self, path, key, interval):
+        self.path = path
+        self.key = key
+        self.interval = interval
+        self.last = time.time()
+        self.steps = 0
+        # The frontier nodes that are not being explored yet.
+        self.rest = []
+
+    def Load(self):
+        """
+        The builder, stats and frontier of the checkpoint, or None if
+        there is no checkpoint file.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            data = Pickling.Loads(f.read())
+        if data["key"] != self.key:
+            raise Mismatch("Checkpoint " + self.path + " is for another program or other options")
+        return data["builder"], data["stats"], data["frontier"]
+
+    def Due(self):
+        self.steps += 1
+        return self.interval > 0 and self.steps % Checkpoint.CHECK == 0 and time.time() - self.last >= self.interval
+
+    def Save(self, b, stats, frontier):
+        """
+        Write the builder b, stats and frontier (and the rest of the
+        frontier) to the checkpoint file.
+        """
+        data = {"key": self.key, "builder": b, "stats": stats, "frontier": frontier + self.rest}
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(Pickling.Dumps(data))
+        os.replace(tmp, self.path)
+        self.last = time.time()
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Key(code, maxDepth, minimise, abstract, reduce):
+        """
+        The key of the checkpoints for code (bytes) and the options.
+        """
+        return "%s:%d:%d:%d:%d" % (hashlib.sha256(code).hexdigest(), maxDepth, minimise, abstract * StackAbstraction.VERSION, reduce)
+
+    @staticmethod
+    def BuildCFG(prog, maxDepth, minimise, checkpoint, project=None, budget=None):
+        """
+        Same as Explorer.BuildCFG(prog, maxDepth, minimise, project, budget),
+        resumed from checkpoint and saved to it.
+        """
+        saved = checkpoint.Load()
+        if saved is None:
+            init = CFGState.default__.DEFAULT__GSTATE
+            b = AutoBuilder.AutoBuilder()
+            b.AddState(init)
+            stats = Statistics.Stats_Stats(False, 0, 0, 0, (0, 0))
+            nodes = [([init], [], 0)]
+        else:
+            b, s0, nodes = saved
+            stats = Explorer.default__.Stats(Statistics.Stats_Stats(False, s0.visitedStates, s0.wPreInvSuccess, s0.errorState, (0, 0)),
+                loopHits=s0.loopHits, loopMisses=s0.loopMisses)
+        frontier = []
+        for k, (states, exits, start) in enumerate(nodes):
+            checkpoint.rest = nodes[k + 1:]
+            if budget is not None and budget.hit is not None:
+                frontier.extend(nodes[k:])
+                break
+            depth = maxDepth - (len(states) - 1)
+            if depth <= 0:
+                frontier.append((states, exits, start))
+                stats = stats.SetMaxDepth()
+                continue
+            p = EVMObject.Path_Path(_dafny.SeqWithoutIsStrInference(states), _dafny.SeqWithoutIsStrInference(exits))
+            stats = Explorer.default__.Explore(prog, p, b, depth, stats, project, None, budget, frontier, start, checkpoint)
+        checkpoint.rest = []
+        checkpoint.Save(b, stats, frontier)
+        a1 = b.Freeze()
+        if not minimise or a1.SSize() == 0:
+            return a1, stats
+        return Explorer.default__.Minimise(a1, stats)
@@ -0,0 +1,106 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# DOT output of a CFG as a generator of str lines.
+# CFGObj.ToDot and Automata.ToDot print token by token with _dafny.print,
+# building a Seq for each token, and the edge labels (EVMObj.DotLabel)
+# are built as Seqs too.
+# Lines below produces the same text, one str per node and per edge, so
+# that it can be written in chunks to any sink (see Sink). The labels of
+# the nodes are built once per segment and stack size.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import Listing
+
+# Module: Dot
+
+NODE_STYLE = "node [shape=none, fontname=arial, style=\"rounded, filled\", fillcolor= \"whitesmoke\"]\nedge [fontname=arial]\nranking=TB"
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Label(xs, s, exit):
+        """
+        Same as EVMObj.DotLabel(s, exit) for the segments xs.
+        """
+        if s.is_ErrorGState:
+            lab = "Error"
+        elif s.is_EGState and exit < xs[s.segNum].NumberOfExits():
+            if xs[s.segNum].IsJump() and exit == xs[s.segNum].NumberOfExits() - 1:
+                lab = "tooltip=\"Jump\",style=dashed"
+            else:
+                lab = "tooltip=\"Next\""
+        else:
+            lab = "Error Number of exits"
+        return " [" + lab + "]"
+
+    @staticmethod
+    def Lines(cfg, noTable, name, wPre = None):
+        """
+        The lines printed by cfg.ToDot(noTable, name). wPre is
+        cfg.computeWpre(), computed here if it is None.
+        """
+        a, stats = cfg.a, cfg.stats
+        xs = cfg.prog.xs
+        size, edges = a.SSize(), a.TSize(0)
+        yield "/*\n"
+        yield "maxDepth is:" + str(cfg.maxDepth) + "\n"
+        yield stats.PrettyPrint().VerbatimString(False)
+        yield "# of reachable invalid segments is: " + str(len(cfg.ReachableInvalidSegs())) + "\n"
+        if not cfg.minimised:
+            yield "Size of CFG: %d nodes, %d edges\n" % (size, edges)
+            yield "Raw CFG\n"
+        else:
+            yield "Size of non minimised CFG: %d nodes, %d edges\n" % tuple(stats.nonMinimisedSize)
+            yield "Size of minimised CFG: %d nodes, %d edges\n" % (size, edges)
+            yield "Minimised CFG\n"
+        yield "*/\n"
+        if wPre is None:
+            wPre = cfg.computeWpre()
+        if wPre.is_Some:
+            yield "// Wpre fixpoint status: " + ("Reached" if wPre.v.is_Left else "Not reached") + "\n"
+        title = cfg.MakeTitle(name, size, edges, cfg.maxDepth, stats.maxDepthReached).VerbatimString(False)
+        yield "// Number of states: %d\n" % size
+        yield "// Number of transitions : %d\n" % edges
+        yield "digraph G {\n"
+        yield "graph[labelloc=\"t\", labeljust=\"l\", label=<" + title + ">]\n" + NODE_STYLE + "\n"
+        # The label of a state only depends on its segment and wPre value.
+        values = cfg.ExtractWpre(wPre.v) if wPre.is_Some else None
+        labels = {}
+        for i, s in enumerate(a.states):
+            k = (s.segNum if s.is_EGState else None, values[i] if values is not None else None)
+            label = labels.get(k)
+            if label is None:
+                label = cfg.PrintState(s, noTable, wPre).VerbatimString(False)
+                labels[k] = label
+            yield "s_%d [label=%s]\n" % (i, label)
+        for i, s in enumerate(a.states):
+            for j, t in enumerate(a.transitionsNat[i]):
+                yield "s_%d -> s_%d%s;\n" % (i, t, default__.Label(xs, s, j))
+        yield "}\n"
+        if not cfg.minimised:
+            yield "//----------------- Raw CFG -------------------\n"
+        else:
+            yield "//----------------- Minimised CFG -------------------\n"
+
+    @staticmethod
+    def Write(cfg, noTable, name, out = None):
+        """
+        Write the DOT output of cfg to out (a sink, stdout by default).
+        """
+        Listing.default__.Write(default__.Lines(cfg, noTable, name), out)
@@ -0,0 +1,294 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Iterative version of EVMObj.DFS.
+# The generated DFS uses one Python frame per node on the current path, so
+# deep explorations fail with a RecursionError, and computes NextG of the
+# last node on the path once more for each successor.
+# DFS below keeps the path (a PathIndex.Path) and the successors still to
+# be explored on an explicit stack, computes NextG once per node, checks
+# the loops with LoopMemo.Find and builds the same automaton and stats
+# (same order of states and edges) with an AutoBuilder.
+# BuildCFG can also explore the abstract states given by a projection
+# (see StackAbstraction), and Explore can stop at some states and reuse
+# the successors computed by another exploration (see ParallelExplorer).
+# A Budget bounds the number of states, the time and the memory of the
+# exploration. When it is exceeded, the exploration stops and the partial
+# automaton is returned, with the limit exceeded in its Stats.
+# Explore can also record its frontier: the nodes cut at max depth and,
+# when the budget is exceeded, the nodes still being explored. A node of
+# the frontier is (path states, path exits, next exit to explore), and can
+# be explored later with a larger max depth (see Checkpoint).
+# Minimise computes the same quotient as GStateMinimiser with
+# HopcroftMinimiser.
+# Install() replaces EVMObj.DFS and EVMObj.BuildCFG.
+# This file is copied into the output of the Dafny python generator.
+import os
+import time
+import resource
+
+import module_
+import _dafny
+import System_
+import CFGState
+import Statistics
+import EVMObject
+import AutoBuilder
+import PathIndex
+import SegmentMemo
+import LoopMemo
+import HopcroftMinimiser
+
+# Module: Explorer
+
+def RssKb():
+    """
+    The resident memory of the process in KB (the peak resident memory
+    where /proc is not available).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class Stats(Statistics.Stats_Stats):
+    """
+    The stats of an exploration with the name of the limit of the Budget
+    that was exceeded (budget, None if the exploration was not stopped),
+    and the number of loop checks found in (loopHits) and added to
+    (loopMisses) the tables of LoopMemo.
+    """
+    budget = None
+    loopHits = 0
+    loopMisses = 0
+
+    def PrettyPrint(self):
+        r = super().PrettyPrint()
+        return r if self.budget is None else r + ToSeq("Budget exceeded:" + self.budget + "\n")
+
+class Frame:
+    """
+    A node of the path being explored: its successors, the index of the next
+    successor to explore and the remaining depth.
+    """
+    def  __init__(self, node, succs, depth):
+        self.node = node
+        self.succs = succs
+        self.next = 0
+        self.depth = depth
+
+class Budget:
+    """
+    The max number of states, seconds (from the creation of the budget)
+    and resident memory of an exploration (0 is no limit). hit is the
+    name of the first limit exceeded, or None.
+    The resident memory is that of the process when it is checked, not its
+    peak, so that a process can explore several programs.
+    """
+    # The time and memory are checked every CHECK steps.
+    CHECK = 256
+
+    def  __init__(self, maxStates=0, maxSeconds=0, maxRssMb=0):
+        self.maxStates = maxStates
+        self.deadline = time.time() + maxSeconds if maxSeconds > 0 else None
+        self.maxRssKb = maxRssMb * 1024
+        self.steps = 0
+        self.hit = None
+
+    def Exceeded(self, b):
+        """
+        Whether a limit is exceeded when the builder b is being explored.
+        """
+        if self.hit is not None:
+            return True
+        self.steps += 1
+        if self.maxStates > 0 and b.SSize() >= self.maxStates:
+            self.hit = "max-states"
+        elif self.steps % Budget.CHECK == 0:
+            if self.deadline is not None and time.time() >= self.deadline:
+                self.hit = "max-seconds"
+            elif self.maxRssKb > 0 and RssKb() >= self.maxRssKb:
+                self.hit = "max-rss-mb"
+        return self.hit is not None
+
+    def Stop(self, limit):
+        """
+        Stop the exploration, for the reason limit (e.g. a timeout). Only
+        sets hit, so that it can be called by a signal handler.
+        """
+        if self.hit is None:
+            self.hit = limit
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def DFS(prog, p, a, maxDepth, debugInfo, stats):
+        """
+        Same as EVMObj.DFS(p, a, maxDepth, debugInfo, stats) on prog.
+        """
+        b = AutoBuilder.default__.FromAuto(a)
+        stats = default__.Explore(prog, p, b, maxDepth, stats)
+        return b.Freeze(), stats
+
+    @staticmethod
+    def Explore(prog, p, b, maxDepth, stats, project=None, cut=None, budget=None, frontier=None, start=0, checkpoint=None, nexts=None):
+        """
+        Add the states and edges found from the last state of p to the
+        builder b. Returns the updated stats.
+        If project is not None, the successors of a state s are the
+        project(s') for s' in NextG(s).
+        If cut is not None, a new state s' (exit i of s) is added but not
+        explored if cut(s, i, s', states, exits, depth) holds, where states
+        and exits are the path to s and depth is the remaining depth of s'.
+        If budget is not None, the exploration stops when it is exceeded.
+        If frontier is not None, the nodes that are not explored because of
+        the max depth or the budget are appended to it. The exploration of
+        the last state of p starts at exit start. If checkpoint is not None,
+        checkpoint.Save is called when checkpoint.Due() holds.
+        If nexts is not None, it maps states to their NextG: the successors
+        of a state are looked up in nexts, and added to it when they are
+        computed.
+        b.Enter(s) and b.Leave(s) are called when the exploration of a state
+        s starts and ends (see Reducer).
+        The stats returned are a Stats with the fields of stats, the loop
+        checks of this exploration added, and the limit of the budget if it
+        is exceeded.
+        """
+        def Next(s):
+            if nexts is None:
+                succs = prog.NextG(s)
+            else:
+                succs = nexts.get(s)
+                if succs is None:
+                    succs = nexts[s] = prog.NextG(s)
+            return succs if project is None else [project(t) for t in succs]
+        def Pending():
+            # The nodes being explored, deepest first.
+            base = len(path) - len(stack)
+            return [(path.states[:base + j + 1], path.exits[:base + j], stack[j].next) for j in reversed(range(len(stack)))]
+        def Done(stats, **extra):
+            # The fields of the stats given, with the loop checks of this
+            # exploration.
+            loopHits = fields.get("loopHits", 0) + loops.hits
+            loopMisses = fields.get("loopMisses", 0) + loops.misses
+            return default__.Stats(stats, **dict(fields, loopHits=loopHits, loopMisses=loopMisses, **extra))
+        fields = stats.__dict__
+        loops = SegmentMemo.Counter()
+        path = PathIndex.Path(p.states, p.exits)
+        root = path.Last()
+        if maxDepth == 0 or root.is_ErrorGState:
+            if maxDepth == 0 and frontier is not None:
+                frontier.append((path.states, path.exits, start))
+            return Done(stats.SetMaxDepth() if maxDepth == 0 else stats)
+        b.Enter(root)
+        stack = [Frame(root, Next(root), maxDepth)]
+        stack[0].next = start
+        while stack:
+            if budget is not None and budget.Exceeded(b):
+                if frontier is not None:
+                    frontier.extend(Pending())
+                return Done(stats, budget=budget.hit)
+            if checkpoint is not None and checkpoint.Due():
+                checkpoint.Save(b, Done(stats), frontier + Pending())
+            f = stack[-1]
+            if f.next == len(f.succs):
+                stack.pop()
+                b.Leave(f.node)
+                if stack:
+                    path.Pop()
+                continue
+            i = f.next
+            f.next += 1
+            last = f.node
+            succ = f.succs[i]
+            if succ.is_ErrorGState:
+                b.AddEdge(last, succ)
+                stats = stats.IncError()
+                continue
+            if succ in b:
+                b.AddEdge(last, succ)
+                stats = stats.IncVisited()
+                continue
+            if prog.xs[last.segNum].IsJump():
+                loop = LoopMemo.default__.Find(prog, succ.segNum, path, i, loops)
+                if loop.is_Some:
+                    b.AddEdge(last, path.states[loop.v])
+                    stats = stats.IncWpre()
+                    continue
+            b.AddEdge(last, succ)
+            if f.depth == 1:
+                stats = stats.SetMaxDepth()
+                if frontier is not None:
+                    frontier.append((path.states + [succ], path.exits + [i], 0))
+                continue
+            if cut is not None and cut(last, i, succ, path.states, path.exits, f.depth - 1):
+                continue
+            path.Push(succ, i)
+            b.Enter(succ)
+            stack.append(Frame(succ, Next(succ), f.depth - 1))
+        return Done(stats)
+
+    @staticmethod
+    def Stats(s, **fields):
+        """
+        The Stats of the counters of s (a Stats_Stats) with the fields of s
+        and fields.
+        """
+        r = Stats(*s)
+        r.__dict__.update(s.__dict__)
+        r.__dict__.update(fields)
+        return r
+
+    @staticmethod
+    def Minimise(a1, s1):
+        """
+        The minimised automaton of a1 and s1 with its nonMinimisedSize, as in EVMObj.BuildCFG.
+        """
+        # The initial partition of EVMObj.BuildCFG: the states of the same
+        # segment, and each error state on its own.
+        blocks = {}
+        for x, s in enumerate(a1.states):
+            blocks.setdefault(s.segNum if s.is_EGState else (x,), []).append(x)
+        succs = [list(a1.SuccNat(x)) for x in range(a1.SSize())]
+        a2 = HopcroftMinimiser.default__.Quotient(a1, HopcroftMinimiser.default__.Refine(succs, list(blocks.values())))
+        s2 = default__.Stats(Statistics.Stats_Stats(s1.maxDepthReached, s1.visitedStates, s1.wPreInvSuccess, s1.errorState, (a1.SSize(), a1.TSize(0))), **s1.__dict__)
+        return a2, s2
+
+    @staticmethod
+    def BuildCFG(prog, maxDepth, minimise, project=None, budget=None, nexts=None):
+        """
+        Same as EVMObj.BuildCFG(maxDepth, minimise) on prog, on the states
+        given by project if it is not None, within budget if it is not None,
+        with the successors of nexts if it is not None (see Explore).
+        """
+        init = CFGState.default__.DEFAULT__GSTATE
+        b = AutoBuilder.AutoBuilder()
+        b.AddState(init)
+        p0 = EVMObject.Path_Path(_dafny.SeqWithoutIsStrInference([init]), _dafny.SeqWithoutIsStrInference([]))
+        s1 = default__.Explore(prog, p0, b, maxDepth, Statistics.Stats_Stats(False, 0, 0, 0, (0, 0)), project, None, budget, nexts=nexts)
+        a1 = b.Freeze()
+        if not minimise or a1.SSize() == 0:
+            return a1, s1
+        return default__.Minimise(a1, s1)
+
+    @staticmethod
+    def Install():
+        EVMObject.EVMObj.DFS = default__.DFS
+        EVMObject.EVMObj.BuildCFG = default__.BuildCFG
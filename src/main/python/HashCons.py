@@ -0,0 +1,193 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Hash-consed abstract stacks.
+# The stack of an AState is a Seq: Push/PopN/Dup/Swap copy it, and hashing
+# a GState (to look it up in the automaton) hashes all its elements.
+# Stack is a Seq made of shared cons cells (top element, rest of the
+# stack). Cells are interned: two equal stacks are the same object, so
+# they compare by identity, and the hash of a cell is computed once from
+# its top and the hash of its rest (O(1) per push).
+# Install() replaces the stack operations of State.AState by operations
+# on Stacks, makes the stack of every EState and EGState a Stack (so that
+# the hashes of equal states are equal), and makes StackElem_Random("") a
+# singleton.
+# The stacks are equal to the Seqs they replace, but their hashes differ.
+# This file is copied into the output of the Dafny python generator.
+import weakref
+
+import module_
+import _dafny
+import System_
+import State
+import CFGState
+import StackElement
+
+# Module: HashCons
+
+class Stack(_dafny.Seq):
+    """
+    The stack top :: rest (rest is a Stack or None for the empty stack).
+    Use Cons or Stack.EMPTY, not the constructor.
+    """
+    def  __init__(self, top, rest):
+        self.top = top
+        self.rest = rest
+        self.len = 0 if rest is None else rest.len + 1
+        self.isStr = None
+        self._hash = hash(()) if rest is None else hash((top, rest._hash))
+
+    @property
+    def elems(self):
+        """
+        The list of the elements (built at each call, not kept).
+        """
+        return list(self)
+
+    def Drop(self, n):
+        """
+        The stack without its n top elements.
+        """
+        s = self
+        for _ in range(n):
+            s = s.rest
+        return s
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.len)
+            if step == 1 and stop == self.len:
+                return self.Drop(start)
+            return super().__getitem__(key)
+        if key < 0:
+            key += self.len
+        if not 0 <= key < self.len:
+            raise IndexError(key)
+        return self.Drop(key).top
+
+    def __iter__(self):
+        s = self
+        while s.rest is not None:
+            yield s.top
+            s = s.rest
+
+    def set(self, key, value):
+        return default__.FromSeq(super().set(key, value))
+
+    def __eq__(self, other):
+        if isinstance(other, Stack):
+            return self is other
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (_dafny.SeqWithoutIsStrInference, (list(self),))
+
+Stack.EMPTY = Stack(None, None)
+
+# The interned cells, keyed by (top, id(rest)). rest is interned, and kept
+# alive by the cell, so its id identifies it. Unused cells are removed.
+CELLS = weakref.WeakValueDictionary()
+
+RANDOM = StackElement.StackElem_Random(_dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, "")))
+
+def Cons(top, rest):
+    key = (top, id(rest))
+    s = CELLS.get(key)
+    if s is None:
+        s = Stack(top, rest)
+        CELLS[key] = s
+    return s
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def FromSeq(xs):
+        """
+        The Stack with the elements of the Seq xs.
+        """
+        if isinstance(xs, Stack):
+            return xs
+        s = Stack.EMPTY
+        for e in reversed(xs.Elements):
+            s = Cons(e, s)
+        return s
+
+    @staticmethod
+    def Peek(s, k):
+        return default__.FromSeq(s.stack)[k]
+
+    @staticmethod
+    def PopN(s, n):
+        return State.AState_EState(s.pc, default__.FromSeq(s.stack).Drop(n))
+
+    @staticmethod
+    def Push(s, v):
+        return State.AState_EState(s.pc, Cons(v, default__.FromSeq(s.stack)))
+
+    @staticmethod
+    def PushNRandom(s, n):
+        st = default__.FromSeq(s.stack)
+        for _ in range(n):
+            st = Cons(RANDOM, st)
+        return State.AState_EState(s.pc, st)
+
+    @staticmethod
+    def Dup(s, n):
+        st = default__.FromSeq(s.stack)
+        return State.AState_EState(s.pc, Cons(st[n - 1], st))
+
+    @staticmethod
+    def Swap(s, n):
+        st = default__.FromSeq(s.stack)
+        top = st.top
+        cells = []
+        for _ in range(n):
+            cells.append(st.top)
+            st = st.rest
+        nth = st.top
+        st = Cons(top, st.rest)
+        for e in reversed(cells[1:]):
+            st = Cons(e, st)
+        return State.AState_EState(s.pc, Cons(nth, st))
+
+    @staticmethod
+    def NewRandom(cls, s):
+        if len(s) == 0 and isinstance(RANDOM, cls):
+            return RANDOM
+        return tuple.__new__(cls, (s,))
+
+    @staticmethod
+    def NewEState(cls, pc, stack):
+        return tuple.__new__(cls, (pc, stack if isinstance(stack, Stack) else default__.FromSeq(stack)))
+
+    @staticmethod
+    def NewEGState(cls, segNum, st):
+        return tuple.__new__(cls, (segNum, st if isinstance(st, Stack) else default__.FromSeq(st)))
+
+    @staticmethod
+    def Install():
+        State.AState.Peek = default__.Peek
+        State.AState.PopN = default__.PopN
+        State.AState.Push = default__.Push
+        State.AState.PushNRandom = default__.PushNRandom
+        State.AState.Dup = default__.Dup
+        State.AState.Swap = default__.Swap
+        State.AState_EState.__new__ = default__.NewEState
+        CFGState.GState_EGState.__new__ = default__.NewEGState
+        StackElement.StackElem_Random.__new__ = default__.NewRandom
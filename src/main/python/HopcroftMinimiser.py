@@ -0,0 +1,129 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Partition refinement minimiser of the CFG automata.
+# GStateMinimiser.Pair.Minimise refines the partition with RefineAll until
+# the number of classes is stable: each round compares the sequences of
+# classes of the successors (ClassSucc, with a linear GetClass per
+# successor) of all the states of each class.
+# The fixpoint is the coarsest refinement of the initial partition in which
+# two states of a class have the same number of successors and their k-th
+# successors are in the same class, for each k. This is the minimisation
+# of a (partial) deterministic automaton whose labels are the positions of
+# the successors, and Refine computes it with Hopcroft's algorithm (split
+# by the predecessors of a block for each label, and only queue the
+# smaller half of a block that is not queued) in O(m log n).
+# Quotient builds the same automaton as Pair.MapToClasses (the class
+# representative is its smallest state).
+# Install() replaces GStateMinimiser.Pair.Minimise.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import GStateMinimiser
+import AutoBuilder
+
+# Module: HopcroftMinimiser
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Refine(succs, blocks):
+        """
+        The coarsest refinement of blocks (lists of states, a partition of
+        0..len(succs) - 1) in which the states of a block have the same
+        number of successors and their k-th successors in the same block.
+        Returns the block of each state.
+        """
+        n = len(succs)
+        # Split the blocks by number of successors.
+        parts = []
+        for b in blocks:
+            byLen = {}
+            for x in b:
+                byLen.setdefault(len(succs[x]), []).append(x)
+            parts.extend(byLen.values())
+        blockOf = [0] * n
+        members = []
+        for k, b in enumerate(parts):
+            members.append(set(b))
+            for x in b:
+                blockOf[x] = k
+        # preds[j][t]: the states whose j-th successor is t.
+        width = max((len(s) for s in succs), default=0)
+        preds = [{} for _ in range(width)]
+        for x, s in enumerate(succs):
+            for j, t in enumerate(s):
+                preds[j].setdefault(t, []).append(x)
+        pending = list(range(len(members)))
+        queued = [True] * len(members)
+        while pending:
+            s = pending.pop()
+            queued[s] = False
+            splitter = list(members[s])
+            for j in range(width):
+                marked = {}
+                for t in splitter:
+                    for x in preds[j].get(t, ()):
+                        marked.setdefault(blockOf[x], []).append(x)
+                for b, xs in marked.items():
+                    if len(xs) == len(members[b]):
+                        continue
+                    c = len(members)
+                    members.append(set(xs))
+                    members[b].difference_update(xs)
+                    for x in xs:
+                        blockOf[x] = c
+                    if queued[b]:
+                        queued.append(True)
+                        pending.append(c)
+                    else:
+                        small = c if len(members[c]) <= len(members[b]) else b
+                        queued.append(small == c)
+                        queued[b] = queued[b] or small == b
+                        pending.append(small)
+        return blockOf
+
+    @staticmethod
+    def Quotient(a, blockOf):
+        """
+        The automaton of the classes blockOf of the states of a, as built by
+        GStateMinimiser.Pair.MapToClasses.
+        """
+        rep = {}
+        for x in range(len(blockOf)):
+            rep.setdefault(blockOf[x], x)
+        b = AutoBuilder.AutoBuilder()
+        for x in range(a.SSize()):
+            src = a.states[rep[blockOf[x]]]
+            for t in a.SuccNat(x):
+                b.AddEdge(src, a.states[rep[blockOf[t]]])
+            b.AddState(src)
+        return b.Freeze()
+
+    @staticmethod
+    def Minimise(p):
+        """
+        Same as p.Minimise() for the GStateMinimiser.Pair p.
+        """
+        a = p.aut
+        succs = [list(a.SuccNat(x)) for x in range(a.SSize())]
+        blocks = [list(c) for c in p.clazz.elem]
+        return default__.Quotient(a, default__.Refine(succs, blocks))
+
+    @staticmethod
+    def Install():
+        GStateMinimiser.Pair.Minimise = default__.Minimise
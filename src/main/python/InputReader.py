@@ -0,0 +1,128 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Read the bytecode to process from a file, stdin or a string.
+# Driver.Main takes the bytecode as the last element of argv and checks it
+# with Hex.IsHexString on a Seq of characters.
+# This module works on the raw buffer instead: files are mapped with mmap,
+# the 0x prefix and surrounding whitespace are skipped without copying, and
+# binascii.unhexlify checks and decodes the hex digits in one pass.
+# Raw binary inputs (bytecode bytes, not hex) are returned as a memoryview
+# of the mapped file.
+# This file is copied into the output of the Dafny python generator.
+import sys
+import os
+import mmap
+import binascii
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import MiscTypes
+
+# Module: InputReader
+
+WHITESPACE = b' \t\r\n'
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Map(path):
+        """
+        A read-only view of the content of the file path.
+        Empty files cannot be mapped and yield an empty view.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b'')
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def Strip(buf):
+        """
+        buf without surrounding whitespace and without the 0x prefix.
+        The result is a view on buf, nothing is copied.
+        """
+        i, j = 0, len(buf)
+        while i < j and buf[i] in WHITESPACE:
+            i += 1
+        while j > i and buf[j - 1] in WHITESPACE:
+            j -= 1
+        if j - i >= 2 and buf[i] == 0x30 and buf[i + 1] in b'xX':
+            i += 2
+        return buf[i:j]
+
+    @staticmethod
+    def FromHex(buf):
+        """
+        Decode the hex text in buf (bytes-like, possibly with 0x prefix).
+        Returns Success(bytes) or Failure(msg) with the messages of Driver.Main.
+        """
+        s = default__.Strip(memoryview(buf).cast('B'))
+        if len(s) == 0:
+            return MiscTypes.Try_Failure(ToSeq("String must be non empty \n"))
+        if len(s) % 2 != 0:
+            return MiscTypes.Try_Failure(ToSeq("String must have even length, length is " + str(len(s)) + "\n"))
+        try:
+            return MiscTypes.Try_Success(binascii.unhexlify(s))
+        except binascii.Error:
+            return MiscTypes.Try_Failure(ToSeq("String must be hexadecimal\n"))
+
+    @staticmethod
+    def FromBinary(buf):
+        """
+        Raw bytecode in buf. Returns Success(view) or Failure(msg).
+        """
+        view = memoryview(buf).cast('B')
+        if len(view) == 0:
+            return MiscTypes.Try_Failure(ToSeq("String must be non empty \n"))
+        return MiscTypes.Try_Success(view)
+
+    @staticmethod
+    def ReadFile(path, binary):
+        """
+        The bytecode in the file path, hex text or raw bytes if binary.
+        """
+        try:
+            buf = default__.Map(path)
+        except OSError as e:
+            return MiscTypes.Try_Failure(ToSeq("Cannot read " + path + ": " + e.strerror + "\n"))
+        return default__.FromBinary(buf) if binary else default__.FromHex(buf)
+
+    @staticmethod
+    def ReadStdin(binary):
+        """
+        The bytecode on stdin, hex text or raw bytes if binary.
+        """
+        buf = sys.stdin.buffer.read()
+        return default__.FromBinary(buf) if binary else default__.FromHex(buf)
+
+    @staticmethod
+    def ReadString(s):
+        """
+        The bytecode in the hex string s (the last argument of Driver.Main).
+        """
+        try:
+            buf = s.encode('ascii')
+        except UnicodeEncodeError:
+            return MiscTypes.Try_Failure(ToSeq("String must be hexadecimal\n"))
+        return default__.FromHex(buf)
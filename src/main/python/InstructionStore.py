@@ -0,0 +1,187 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Compact representation of a disassembled program.
+# A Seq of Instructions.Instruction costs a tuple, an Opcode reference and an
+# argument Seq per instruction.
+# InstructionStore keeps one byte (the opcode) and one address per
+# instruction in arrays; the PUSH arguments are read from the code itself.
+# Instruction objects are only built when they are accessed, through an
+# InstructionRange, a Seq view on a range of the store.
+# This file is copied into the output of the Dafny python generator.
+import sys
+from array import array
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import EVMConstants
+import OpcodeTable
+import ByteDisassembler
+import Instructions
+import RangeSplitter
+import EVMObject
+import JumpTable
+
+# Module: InstructionStore
+
+OPCODES = OpcodeTable.OPCODES
+ARGS = OpcodeTable.ARGS
+EMPTY_ARG = _dafny.SeqWithoutIsStrInference([])
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class InstructionStore:
+    """
+    The instructions of a program.
+    ops[i] is the byte of the i-th instruction and addrs[i] its address.
+    If the code ends with a malformed instruction, the last instruction is
+    INVALID with argument tailArg.
+    """
+    def  __init__(self, code, ops, addrs, tailArg):
+        self.code = code
+        self.ops = ops
+        self.addrs = addrs
+        self.tailArg = tailArg
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __getitem__(self, i):
+        return self.Instruction(i)
+
+    def Opcode(self, i):
+        return OPCODES[self.ops[i]]
+
+    def Address(self, i):
+        return self.addrs[i]
+
+    def Immediate(self, i):
+        """
+        The argument of the i-th instruction as an int, or None if it has none.
+        """
+        k = ARGS[self.ops[i]]
+        if k == 0 or self.IsTail(i):
+            return None
+        a = self.addrs[i] + 1
+        return int.from_bytes(self.code[a:a + k], 'big')
+
+    def IsTail(self, i):
+        return self.tailArg is not None and i == len(self.ops) - 1
+
+    def Arg(self, i):
+        """
+        The argument of the i-th instruction as in BinaryDecoder.DisassembleU8.
+        """
+        if self.IsTail(i):
+            return self.tailArg
+        k = ARGS[self.ops[i]]
+        if k == 0:
+            return EMPTY_ARG
+        a = self.addrs[i] + 1
+        return ToSeq(bytes(self.code[a:a + k]).hex())
+
+    def Instruction(self, i):
+        if i < 0:
+            i += len(self.ops)
+        if not 0 <= i < len(self.ops):
+            raise IndexError(i)
+        return Instructions.Instruction_Instruction(self.Opcode(i), self.Arg(i), self.addrs[i])
+
+    def Range(self, start, end):
+        return InstructionRange(self, start, end)
+
+    def ToSeq(self):
+        return InstructionRange(self, 0, len(self.ops))
+
+    def Segments(self):
+        return RangeSplitter.default__.Split(self)
+
+    def EVMObj(self):
+        """
+        The EVMObj of the program, as built by Driver.Main, with the tables
+        of JumpTable.
+        """
+        y = self.Segments()
+        return EVMObject.EVMObj_EVMObj(y, JumpTable.default__.CollectJumpDests(y), JumpTable.default__.CollectThem(y))
+
+class InstructionRange(_dafny.Seq):
+    """
+    The instructions start..end-1 of a store as a Seq.
+    Indexing and slicing do not build the other instructions.
+    """
+    def  __init__(self, store, start, end):
+        self.store = store
+        self.start = start
+        self.len = max(0, end - start)
+        self.isStr = None
+        self._elems = None
+
+    @property
+    def elems(self):
+        if self._elems is None:
+            self._elems = [self.store.Instruction(i) for i in range(self.start, self.start + self.len)]
+        return self._elems
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.len)
+            if step == 1:
+                return InstructionRange(self.store, self.start + start, self.start + stop)
+            return super().__getitem__(key)
+        if key < 0:
+            key += self.len
+        if not 0 <= key < self.len:
+            raise IndexError(key)
+        if self._elems is not None:
+            return self._elems[key]
+        return self.store.Instruction(self.start + key)
+
+    def __iter__(self):
+        if self._elems is not None:
+            return iter(self._elems)
+        return (self.store.Instruction(i) for i in range(self.start, self.start + self.len))
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Build(code):
+        """
+        The store of code (bytes, bytearray, memoryview or hex string without 0x).
+        Same instructions as ByteDisassembler.Disassemble(code), except that
+        PUSH arguments are always lowercase.
+        """
+        s = None
+        if isinstance(code, str):
+            s = code
+            code, _ = ByteDisassembler.default__.FromHex(s)
+        buf = memoryview(code).cast('B') if not isinstance(code, bytes) else code
+        ops = array('B')
+        addrs = array('I')
+        pc = 0
+        for pc, op, end in ByteDisassembler.default__.Walk(buf, len(buf)):
+            ops.append(op)
+            addrs.append(pc)
+            pc = end
+        tailArg = ByteDisassembler.default__.TailError(s, buf, pc)
+        if tailArg is not None:
+            ops.append(EVMConstants.default__.INVALID)
+            addrs.append(pc)
+        return InstructionStore(buf, ops, addrs, tailArg)
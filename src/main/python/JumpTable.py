@@ -0,0 +1,72 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Jump destination and segment tables of an EVMObj.
+# EVMObject.CollectJumpDests builds the jumpDests Seq by concatenation, and
+# each PUSH checks whether its argument is in it with a linear scan.
+# CollectPCToSeg builds the PCToSegMap Map with one copy per segment.
+# CollectJumpDests below returns a JumpDests: the same Seq with a bitmap
+# of the addresses (as in the code analysis of the EVM), so that membership
+# is O(1). CollectThem builds the same Map in one pass.
+# Install() replaces EVMObject.CollectJumpDests and CollectThem.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import EVMConstants
+import EVMObject
+
+# Module: JumpTable
+
+class JumpDests(_dafny.Seq):
+    """
+    The Seq of the addresses of the JUMPDESTs that start a segment.
+    bitmap[pc] is 1 iff pc is one of them.
+    """
+    def  __init__(self, addrs):
+        super().__init__(addrs, isStr=None)
+        self.bitmap = bytearray(max(addrs) + 1 if addrs else 0)
+        for pc in addrs:
+            self.bitmap[pc] = 1
+
+    def __contains__(self, pc):
+        return isinstance(pc, int) and 0 <= pc < len(self.bitmap) and self.bitmap[pc] == 1
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def CollectJumpDests(xs):
+        """
+        Same as EVMObject.CollectJumpDests(xs).
+        """
+        addrs = []
+        for s in xs:
+            i = s.Ins()[0]
+            if i.op.opcode == EVMConstants.default__.JUMPDEST:
+                addrs.append(i.address)
+        return JumpDests(addrs)
+
+    @staticmethod
+    def CollectThem(xs):
+        """
+        Same as EVMObject.CollectThem(xs).
+        """
+        return _dafny.Map({s.StartAddress(): k for k, s in enumerate(xs)})
+
+    @staticmethod
+    def Install():
+        EVMObject.default__.CollectJumpDests = staticmethod(default__.CollectJumpDests)
+        EVMObject.default__.CollectThem = staticmethod(default__.CollectThem)
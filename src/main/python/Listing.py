@@ -0,0 +1,126 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Disassembly and segment listings as generators of str lines.
+# PrettyPrinters.PrintInstructions and PrintSegments print token by token
+# with _dafny.print, building a Seq for each token.
+# The generators below produce the same text one line at a time, so the
+# lines can be written in chunks to a buffered sink and consumed while the
+# code is still being decoded.
+# This file is copied into the output of the Dafny python generator.
+import sys
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import EVMConstants
+import OpcodeTable
+import ByteDisassembler
+import SegBuilder
+
+# Module: Listing
+
+NAMES = OpcodeTable.NAMES
+OPCODES = OpcodeTable.OPCODES
+ARGS = OpcodeTable.ARGS
+INVALID = EVMConstants.default__.INVALID
+TWO_32 = 2 ** 32
+
+def Address(pc):
+    """
+    The address as printed by PrintInstructions.
+    """
+    return "%08x" % pc if pc < TWO_32 else "OutofRange"
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Write(lines, out = None, chunk = 4096):
+        """
+        Write lines to out (a text stream, stdout by default), chunk lines
+        at a time.
+        """
+        out = sys.stdout if out is None else out
+        buf = []
+        for l in lines:
+            buf.append(l)
+            if len(buf) >= chunk:
+                out.write("".join(buf))
+                buf.clear()
+        if buf:
+            out.write("".join(buf))
+
+    @staticmethod
+    def ScanLines(code):
+        """
+        The lines of PrintInstructions(ByteDisassembler.Disassemble(code)),
+        produced while code is decoded.
+        PUSH arguments are printed in lowercase.
+        """
+        for pc, op, arg in ByteDisassembler.default__.Scan(code):
+            # Unknown bytes decode to INVALID
+            if OPCODES[op].opcode == INVALID:
+                yield Address(pc) + ": INVALID " + (arg or "") + "\n"
+            elif arg is None:
+                yield Address(pc) + ": " + NAMES[op] + "\n"
+            else:
+                yield "%s: %s 0x%0*x\n" % (Address(pc), NAMES[op], 2 * ARGS[op], arg)
+
+    @staticmethod
+    def InstructionLines(xs):
+        """
+        The lines of PrintInstructions(xs) for a sequence of Instruction.
+        """
+        for i in xs:
+            op = i.op.opcode
+            arg = i.arg.VerbatimString(False)
+            if op == INVALID:
+                yield Address(i.address) + ": INVALID " + arg + "\n"
+            elif len(arg) > 0:
+                yield Address(i.address) + ": " + NAMES[op] + " 0x" + arg + "\n"
+            else:
+                yield Address(i.address) + ": " + NAMES[op] + "\n"
+
+    @staticmethod
+    def SegmentLines(xs, num = 0):
+        """
+        The lines of PrintSegments(xs, num).
+        """
+        for s in xs:
+            yield "--------------------------------------------\n"
+            yield "Segment " + str(num) + "\n"
+            if s.is_JUMPSeg or s.is_JUMPISeg:
+                r = SegBuilder.default__.JUMPResolver(s)
+                if r.is_Right:
+                    tgt = "Peek(" + str(r.r) + ")"
+                elif r.l.is_Value:
+                    tgt = "0x%x" % r.l.v
+                else:
+                    tgt = "Could not determine stack value"
+                yield "JUMP/JUMPI: tgt address at the end: " + tgt + "\n"
+            if s.is_CONTSeg:
+                if s.lastIns.op.opcode != INVALID:
+                    yield "CONT: PC of instruction after last is:  0x%x\n" % s.StartAddressNextSeg()
+                else:
+                    yield "CONT: has an invalid instruction\n"
+                yield "WeakestPre Operands:" + str(s.WeakestPreOperands(s.Ins(), 0)) + "\n"
+                yield "WeakestPre Capacity:" + str(s.WeakestPreCapacity(0)) + "\n"
+                yield "Net Stack Effect:" + str(s.StackEffect()) + "\n"
+            yield from default__.InstructionLines(s.Ins())
+            num += 1
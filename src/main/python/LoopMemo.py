@@ -0,0 +1,122 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Memoisation of the loop checks of the CFG exploration.
+# For each jump successor, EVMObj.SafeLoopFound computes the weakest
+# precondition of the path from the first occurrence of the target segment
+# (LinSegments.WPreSeqSegs, one step per segment from the end of the path)
+# and checks that it is preserved by the path (PreservesCond, which runs
+# the segments with RunAll), and starts again from the next occurrence.
+# Sibling branches and successive occurrences repeat the same steps.
+# Find below computes the same results on a PathIndex.Path, with the
+# occurrences of the segment given by the index of the path, and two
+# tables: the steps of WPreSeqSegs, keyed by (segment, exit, target pc,
+# post-condition), and PreservesCond, keyed by (condition, exits, initial
+# pc). The tables depend on the program and are cleared when another
+# program is checked. The hits and misses of a search are counted by the
+# counter of its exploration (see Explorer.Stats).
+# Install() replaces EVMObj.SafeLoopFound.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import MiscTypes
+import EVMObject
+import SegmentMemo
+import PathIndex
+
+# Module: LoopMemo
+
+WPRE_STEP = SegmentMemo.Memo("WPreSeqSegs")
+PRESERVES_COND = SegmentMemo.Memo("PreservesCond")
+MEMOS = [WPRE_STEP, PRESERVES_COND]
+
+class default__:
+    def  __init__(self):
+        pass
+
+    # The program of the tables.
+    PROG = None
+
+    @staticmethod
+    def WPreStep(xs, k, exit, tgtPC, c, counter=None):
+        """
+        The weakest precondition of segment k for c, when it leaves by exit
+        to tgtPC (one step of LinSegments.WPreSeqSegs).
+        """
+        def Compute():
+            return xs[k].WPre(c).And(xs[k].LeadsTo(tgtPC, exit))
+        return WPRE_STEP.Get((k, exit, tgtPC, c), Compute, counter)
+
+    @staticmethod
+    def Find(prog, i, path, exit, counter=None):
+        """
+        Same as EVMObj.SafeLoopFound(i, states, exits + [exit]) on prog,
+        where states and exits are those of path (a PathIndex.Path without
+        error states). The weakest preconditions of the suffixes of the path
+        that start at the occurrences of i are computed in one pass. The
+        lookups are counted by counter (a SegmentMemo.Counter) if it is not
+        None.
+        """
+        positions = path.Positions(i)
+        if not positions:
+            return MiscTypes.Option_None()
+        if default__.PROG is not prog:
+            for m in MEMOS:
+                m.table.clear()
+            default__.PROG = prog
+        xs = prog.xs
+        states, exits = path.states, path.exits
+        tgtPC = xs[i].StartAddress()
+        w, pc = xs[states[-1].segNum].LeadsTo(tgtPC, exit), tgtPC
+        conds = [None] * len(positions)
+        j = len(positions) - 1
+        for k in range(len(states) - 1, positions[0] - 1, -1):
+            n = states[k].segNum
+            w = default__.WPreStep(xs, n, exits[k] if k < len(exits) else exit, pc, w, counter)
+            pc = xs[n].StartAddress()
+            if k == positions[j]:
+                conds[j] = w
+                j -= 1
+        # The index is relative to the path after the previous occurrence,
+        # as in EVMObj.SafeLoopFound.
+        start = 0
+        for index, w1 in zip(positions, conds):
+            if w1.is_StTrue:
+                return MiscTypes.Option_Some(index - start)
+            if w1.is_StFalse:
+                return MiscTypes.Option_None()
+            suffix = tuple(exits[index:]) + (exit,)
+            if PRESERVES_COND.Get((w1, suffix, tgtPC), lambda: prog.PreservesCond(w1, _dafny.SeqWithoutIsStrInference(suffix), tgtPC), counter):
+                return MiscTypes.Option_Some(index - start)
+            start = index + 1
+        return MiscTypes.Option_None()
+
+    @staticmethod
+    def SafeLoopFound(prog, i, pStates, pExits):
+        """
+        Same as EVMObj.SafeLoopFound(i, pStates, pExits) on prog.
+        """
+        return default__.Find(prog, i, PathIndex.Path(pStates, pExits), pExits[len(pExits) - 1])
+
+    @staticmethod
+    def Install():
+        EVMObject.EVMObj.SafeLoopFound = default__.SafeLoopFound
+
+    @staticmethod
+    def Stats():
+        """
+        The hits, misses, size and hit rate of each table.
+        """
+        return {m.name: m.Stats() for m in MEMOS}
@@ -0,0 +1,89 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Opcode table indexed by byte.
+# OpcodeDecoder.Decode and the EVMToolTips helpers are long if/elif chains
+# that build a new Opcode (and new name Seq) at every call.
+# The tables below are built once at import and hold shared immutable values.
+# Install() makes the generated modules use them.
+# This file is copied into the output of the Dafny python generator.
+import sys
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import OpcodeDecoder
+import EVMToolTips
+
+# Module: OpcodeTable
+
+# The generated decoders, used to build the tables.
+_Decode = OpcodeDecoder.default__.Decode
+_ToolTip = EVMToolTips.default__.ToolTip
+_Gas = EVMToolTips.default__.Gas
+
+# Opcode for each byte. Unknown bytes decode to INVALID.
+OPCODES = tuple(_Decode(b) for b in range(256))
+
+# Mnemonic of each opcode as a native str.
+NAMES = tuple(op.name.VerbatimString(False) for op in OPCODES)
+
+# Number of immediate bytes for each opcode (PUSH1..PUSH32).
+ARGS = bytes(op.Args() for op in OPCODES)
+
+# Net stack effect (pushes - pops) of each opcode.
+EFFECTS = tuple(op.StackEffect() for op in OPCODES)
+
+# (description, line in bytecode.dfy) for each byte, as in EVMToolTips.ToolTip.
+TOOLTIPS = tuple(_ToolTip(b) for b in range(256))
+
+# Gas cost for each byte, as in EVMToolTips.Gas.
+GAS = tuple(_Gas(b) for b in range(256))
+
+# Same as above as native str.
+TOOLTIP_TEXTS = tuple(t.VerbatimString(False) for t, _ in TOOLTIPS)
+GAS_TEXTS = tuple(g.VerbatimString(False) for g in GAS)
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Decode(op):
+        return OPCODES[op]
+
+    @staticmethod
+    def ToolTip(op):
+        return TOOLTIPS[op]
+
+    @staticmethod
+    def Gas(op):
+        return GAS[op]
+
+    @staticmethod
+    def Install():
+        """
+        Replace OpcodeDecoder.Decode, EVMToolTips.ToolTip and EVMToolTips.Gas
+        by table lookups, so that BinaryDecoder and the HTML renderers
+        share the same Opcode objects.
+        """
+        OpcodeDecoder.default__.Decode = staticmethod(default__.Decode)
+        EVMToolTips.default__.ToolTip = staticmethod(default__.ToolTip)
+        EVMToolTips.default__.Gas = staticmethod(default__.Gas)
+        # classproperties rebuild their Seq at each access, keep one value
+        EVMToolTips.default__.bytecodeRefLine = EVMToolTips.default__.bytecodeRefLine
+        EVMToolTips.default__.gasRefLine = EVMToolTips.default__.gasRefLine
@@ -0,0 +1,164 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Parallel CFG exploration, one subtree per external function.
+# Solidity runtime code starts with a dispatcher: segments that compare the
+# selector with a constant (PUSH4 ... EQ) and JUMPI to the entry of the
+# function. Larger dispatchers first split the selectors with a binary
+# search (PUSH4 ... GT or LT, JUMPI to the other half). Computing the
+# successors of the states (NextG, which runs the segments) is most of the
+# exploration.
+# BuildCFG explores the dispatcher and stops at the function entries (the
+# jump successors of the dispatcher segments). Each entry is then explored
+# by a pool of worker processes, from the path that leads to it, and the
+# workers return the successors of the states they explored. The EVMObj is
+# sent once to each worker. The serial exploration (Explorer.BuildCFG) is
+# then run with these successors, so the automaton and the stats are those
+# of the serial exploration: the states of the workers that it does not
+# reach (e.g. a state of a shared internal function explored with another
+# path or depth) are not in the automaton, and the successors of the states
+# that the workers did not explore are computed by the serial exploration.
+# This file is copied into the output of the Dafny python generator.
+import copy
+import multiprocessing
+
+import module_
+import _dafny
+import System_
+import EVMConstants
+import CFGState
+import Statistics
+import EVMObject
+import Explorer
+import AutoBuilder
+import StackAbstraction
+import Pickling
+import Patches
+
+# Module: ParallelExplorer
+
+# The program explored by a worker.
+PROG = None
+
+def Seq(xs):
+    return _dafny.SeqWithoutIsStrInference(xs)
+
+def NoStats():
+    return Statistics.Stats_Stats(False, 0, 0, 0, (0, 0))
+
+def Warm(budget):
+    """
+    The budget of the explorations of the successors: the time and memory
+    limits of budget, but no max number of states, which is that of the
+    serial exploration.
+    """
+    if budget is None:
+        return None
+    b = copy.copy(budget)
+    b.maxStates = 0
+    return b
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Selector(seg):
+        """
+        The comparison (EQ, GT or LT) of seg if it is a branch of the
+        dispatcher: a JUMPI segment that compares the selector with a
+        constant (DUP1 PUSHn c OP, n <= 4 as the leading zero bytes of c are
+        not pushed) and pushes the jump target.
+        Otherwise None.
+        """
+        if not seg.is_JUMPISeg or len(seg.ins) < 4:
+            return None
+        a, b, op, target = [i.op.opcode for i in seg.ins[-4:]]
+        c = EVMConstants.default__
+        if not c.PUSH1 <= target <= c.PUSH32 or op not in (c.EQ, c.GT, c.LT):
+            return None
+        if a != c.DUP1 or not c.PUSH1 <= b <= c.PUSH4:
+            return None
+        return op
+
+    @staticmethod
+    def IsDispatcher(seg):
+        """
+        Whether seg compares the selector and jumps to a function (EQ). The
+        GT and LT branches of a binary search dispatcher jump to another
+        part of the dispatcher, which is explored here.
+        """
+        return default__.Selector(seg) == EVMConstants.default__.EQ
+
+    @staticmethod
+    def Init(blob):
+        """
+        Worker initialisation: the installed modules and the program.
+        """
+        global PROG
+        Patches.default__.InstallAll()
+        PROG = Pickling.Loads(blob)
+
+    @staticmethod
+    def Work(task):
+        """
+        Explore the subtree of an entry: task is the path to the entry, the
+        remaining depth, whether stacks are abstracted and the budget.
+        Returns the successors of the states explored (NextG, see
+        Explorer.Explore).
+        """
+        states, exits, depth, abstract, budget = task
+        nexts = {}
+        b = AutoBuilder.AutoBuilder()
+        b.AddState(states[0])
+        for k in range(1, len(states)):
+            b.AddEdge(states[k - 1], states[k])
+        Explorer.default__.Explore(PROG, EVMObject.Path_Path(Seq(states), Seq(exits)), b, depth, NoStats(),
+            StackAbstraction.Projection(PROG).Project if abstract else None, None, budget, nexts=nexts)
+        return nexts
+
+    @staticmethod
+    def BuildCFG(prog, maxDepth, minimise, jobs, project=None, budget=None):
+        """
+        Same as Explorer.BuildCFG(prog, maxDepth, minimise, project, budget)
+        with the successors of the states of the function subtrees computed
+        by jobs processes. project must be the Project of a
+        StackAbstraction.Projection if it is not None: the dispatcher and the
+        workers use their own projection, so that only the serial
+        exploration counts the merged states.
+        """
+        dispatcher = {}
+        entries = []
+        abstract = project is not None
+        warm = Warm(budget)
+        def Cut(last, i, succ, states, exits, depth):
+            k = last.segNum
+            if k not in dispatcher:
+                dispatcher[k] = default__.IsDispatcher(prog.xs[k])
+            if dispatcher[k] and i == 1:
+                entries.append((states + [succ], exits + [i], depth, abstract, warm))
+                return True
+            return False
+        nexts = {}
+        init = CFGState.default__.DEFAULT__GSTATE
+        b = AutoBuilder.AutoBuilder()
+        b.AddState(init)
+        p0 = EVMObject.Path_Path(Seq([init]), Seq([]))
+        Explorer.default__.Explore(prog, p0, b, maxDepth, NoStats(),
+            StackAbstraction.Projection(prog).Project if abstract else None, Cut, warm, nexts=nexts)
+        if entries and (warm is None or warm.hit is None):
+            with multiprocessing.Pool(min(jobs, len(entries)), default__.Init, (Pickling.Dumps(prog),)) as pool:
+                for r in pool.imap_unordered(default__.Work, entries):
+                    nexts.update(r)
+        return Explorer.default__.BuildCFG(prog, maxDepth, minimise, project, budget, nexts)
@@ -0,0 +1,179 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Array index of the partitions of PartitionMod.
+# A Partition stores its classes as a Seq of Sets: GetClass scans the
+# classes, GetClassRepOf computes the smallest element of a class with
+# SeqOfSets.SetToSequence (a nested quantifier per element), and MakeInit,
+# SplitIn2, ComputeFinest and RefineAll build the sets one union at a time.
+# An Index is an array of the class of each element, the sorted elements of
+# each class and their representatives (the smallest elements). It is built
+# once per Partition (in O(n log n)) and kept on it, and the partitions
+# computed by the methods below get theirs when they are built.
+# Install() replaces the methods of Partition (same results, same classes
+# in the same order), MakeInit, PrintPartition and SeqOfSets.SetToSequence.
+# The classes of RefineAll with the splitter of GStateMinimiser.Pair are
+# keyed by the classes of the successors, in one pass.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import SeqOfSets
+import PartitionMod
+import GStateMinimiser
+
+# Module: PartitionIndex
+
+class Index:
+    """
+    classes[k] is the sorted list of the elements of class k, classOf[x]
+    the class of x and reps[k] the smallest element of class k.
+    """
+    def  __init__(self, classes):
+        self.classes = classes
+        self.classOf = [None] * max([c[-1] + 1 for c in classes if c], default=0)
+        self.reps = []
+        for k, c in enumerate(classes):
+            for x in c:
+                self.classOf[x] = k
+            self.reps.append(c[0] if c else None)
+
+    def Elements(self):
+        """
+        The sorted elements of all the classes.
+        """
+        return [x for x, k in enumerate(self.classOf) if k is not None]
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Make(n, classes):
+        """
+        The Partition of n with classes (sorted lists) and its Index.
+        """
+        p = PartitionMod.Partition_Partition(n, _dafny.SeqWithoutIsStrInference([_dafny.Set(c) for c in classes]))
+        p.classIndex = Index(classes)
+        return p
+
+    @staticmethod
+    def Of(p):
+        """
+        The Index of p.
+        """
+        r = p.__dict__.get("classIndex")
+        if r is None:
+            r = Index([sorted(c) for c in p.elem])
+            p.classIndex = r
+        return r
+
+    @staticmethod
+    def Signature(equiv):
+        """
+        A function that maps the elements to hashable values that are equal
+        iff the elements are equivalent by equiv, or None if equiv is not
+        known. The splitter of GStateMinimiser.Pair compares the classes of
+        the successors.
+        """
+        if getattr(equiv, "__func__", None) is GStateMinimiser.Pair.Splitter:
+            return equiv.__self__.ClassSucc
+        return None
+
+    @staticmethod
+    def Split(xs, equiv):
+        """
+        Same as PartitionMod.SplitTrueAndFalse on the sorted list xs, as
+        sorted lists: the classes in the order of their smallest elements.
+        The elements are grouped by their Signature if equiv has one (one
+        pass), otherwise each class is split from the rest.
+        """
+        key = default__.Signature(equiv)
+        if key is not None:
+            classes = {}
+            for x in xs:
+                classes.setdefault(key(x), []).append(x)
+            return list(classes.values())
+        r = []
+        while xs:
+            first = xs[0]
+            t, f = [], []
+            for x in xs:
+                (t if equiv(first, x) else f).append(x)
+            r.append(t)
+            xs = f
+        return r
+
+    @staticmethod
+    def MakeInit(n):
+        return default__.Make(n, [list(range(n))])
+
+    @staticmethod
+    def PrintPartition(p):
+        for c in default__.Of(p).classes:
+            _dafny.print(_dafny.string_of(_dafny.SeqWithoutIsStrInference(c)))
+            _dafny.print((_dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, "\n"))).VerbatimString(False))
+
+    @staticmethod
+    def SetToSequence(s):
+        return _dafny.SeqWithoutIsStrInference(sorted(s))
+
+    @staticmethod
+    def SplitIn2(p, f):
+        t, e = [], []
+        for x in default__.Of(p).Elements():
+            (t if f(x) else e).append(x)
+        return default__.Make(p.n, [c for c in (t, e) if c])
+
+    @staticmethod
+    def ComputeFinest(p, equiv):
+        return default__.Make(p.n, default__.Split(default__.Of(p).Elements(), equiv))
+
+    @staticmethod
+    def RefineAll(p, equiv):
+        return default__.Make(p.n, [c for xs in default__.Of(p).classes for c in default__.Split(xs, equiv)])
+
+    @staticmethod
+    def GetClass(p, x, index):
+        """
+        Same as Partition.GetClass(x, index): the class of x, searched from
+        class index.
+        """
+        k = default__.Of(p).classOf[x]
+        if k is None or k < index:
+            raise IndexError("%d is not in the classes from %d" % (x, index))
+        return k
+
+    @staticmethod
+    def GetClassRepOf(p, x):
+        i = default__.Of(p)
+        return i.reps[i.classOf[x]]
+
+    @staticmethod
+    def GetClassRepOfSeqs(p, xs):
+        i = default__.Of(p)
+        return _dafny.SeqWithoutIsStrInference([i.reps[i.classOf[x]] for x in xs])
+
+    @staticmethod
+    def Install():
+        SeqOfSets.default__.SetToSequence = staticmethod(default__.SetToSequence)
+        PartitionMod.default__.MakeInit = staticmethod(default__.MakeInit)
+        PartitionMod.default__.PrintPartition = staticmethod(default__.PrintPartition)
+        P = PartitionMod.Partition
+        P.SplitIn2 = default__.SplitIn2
+        P.ComputeFinest = default__.ComputeFinest
+        P.RefineAll = default__.RefineAll
+        P.GetClass = default__.GetClass
+        P.GetClassRepOf = default__.GetClassRepOf
+        P.GetClassRepOfSeqs = default__.GetClassRepOfSeqs
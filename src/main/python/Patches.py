@@ -0,0 +1,51 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# The hand-written replacements of the generated code.
+# InstallAll() installs all of them, in order, and is called by the drivers
+# (evmdis, Batch) and the worker processes (Batch, ParallelExplorer).
+# A new module with an Install() is added to InstallAll only.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import OpcodeTable
+import JumpTable
+import SegmentMemo
+import LoopMemo
+import SegmentSummary
+import Explorer
+import HopcroftMinimiser
+import PartitionIndex
+import WPreFix
+import HashCons
+
+# Module: Patches
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def InstallAll():
+        OpcodeTable.default__.Install()
+        JumpTable.default__.Install()
+        SegmentMemo.default__.Install()
+        LoopMemo.default__.Install()
+        SegmentSummary.default__.Install()
+        Explorer.default__.Install()
+        HopcroftMinimiser.default__.Install()
+        PartitionIndex.default__.Install()
+        WPreFix.default__.Install()
+        HashCons.default__.Install()
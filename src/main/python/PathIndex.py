@@ -0,0 +1,74 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# The path of the DFS with an index of the positions of the segments.
+# EVMObject.Path stores the states and exits as Seqs, extended with + at
+# each step, and SafeLoopFound looks for the first occurrence of a segment
+# on the path with a linear scan (FindFirstNodeWithSegIndex).
+# Path below is a stack of states and exits (push and pop in O(1)) with,
+# for each segment, the list of its positions on the path, so that the
+# occurrences of a segment (the loop heads) are found in O(1).
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+
+# Module: PathIndex
+
+class Path:
+    """
+    The states of a path and its exits: exits[k] is the exit from states[k]
+    to states[k + 1]. positions[n] is the list of the positions of the
+    states of segment n, in increasing order.
+    """
+    def  __init__(self, states, exits):
+        self.states = []
+        self.exits = []
+        self.positions = {}
+        for k, s in enumerate(states):
+            self.Push(s, exits[k - 1] if k > 0 else None)
+
+    def __len__(self):
+        return len(self.states)
+
+    def Push(self, s, exit):
+        """
+        Add s, reached by exit from the last state (exit is ignored on an
+        empty path).
+        """
+        if self.states:
+            self.exits.append(exit)
+        if s.is_EGState:
+            self.positions.setdefault(s.segNum, []).append(len(self.states))
+        self.states.append(s)
+
+    def Pop(self):
+        s = self.states.pop()
+        if self.states:
+            self.exits.pop()
+        if s.is_EGState:
+            ps = self.positions[s.segNum]
+            ps.pop()
+            if not ps:
+                del self.positions[s.segNum]
+        return s
+
+    def Last(self):
+        return self.states[-1]
+
+    def Positions(self, n):
+        """
+        The positions of the states of segment n.
+        """
+        return self.positions.get(n, [])
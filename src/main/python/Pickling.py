@@ -0,0 +1,52 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Pickling of the generated values (programs, automata, stats), compressed.
+# Used by the result cache, the checkpoints and the workers of the parallel
+# exploration. It only depends on the generated modules.
+# This file is copied into the output of the Dafny python generator.
+import io
+import zlib
+import pickle
+import copyreg
+
+import module_
+import _dafny
+import System_
+import LinSegments
+import InstructionStore
+
+# Module: Pickling
+
+# _dafny.Map overrides items, which breaks the default pickling of dicts.
+# InstructionRange is a view on a store and is pickled as a plain Seq.
+# Segments are pickled without what is kept on them (SegmentMemo keys), and
+# Seqs without their SegmentSummary.
+DISPATCH = dict(copyreg.dispatch_table)
+DISPATCH[_dafny.Map] = lambda m: (_dafny.Map, (list(dict.items(m)),))
+DISPATCH[InstructionStore.InstructionRange] = lambda r: (_dafny.SeqWithoutIsStrInference, (list(r),))
+for kind in (LinSegments.LinSeg_JUMPSeg, LinSegments.LinSeg_JUMPISeg, LinSegments.LinSeg_RETURNSeg,
+        LinSegments.LinSeg_STOPSeg, LinSegments.LinSeg_CONTSeg, LinSegments.LinSeg_INVALIDSeg):
+    DISPATCH[kind] = lambda s: (type(s), tuple(s))
+DISPATCH[_dafny.Seq] = lambda s: (_dafny.Seq, (), {k: v for k, v in s.__dict__.items() if k != "summary"})
+
+def Dumps(value):
+    f = io.BytesIO()
+    p = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+    p.dispatch_table = DISPATCH
+    p.dump(value)
+    return zlib.compress(f.getvalue())
+
+def Loads(blob):
+    return pickle.loads(zlib.decompress(blob))
@@ -0,0 +1,93 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Single-pass segment splitter over an InstructionStore.
+# Splitter.SplitUpToTerminal re-slices its input and grows the current
+# segment by concatenation at each instruction, and BuildSeg recomputes the
+# stack effect of each segment.
+# This module scans the opcodes once, records each segment as a range
+# (start, end) of instruction indices and accumulates the stack effect on
+# the way. The segments are LinSeg values whose instructions are
+# InstructionRange views on the store.
+# This file is copied into the output of the Dafny python generator.
+import sys
+from typing import Callable, Any, TypeVar, NamedTuple
+from math import floor
+from itertools import count
+
+import module_
+import _dafny
+import System_
+import EVMConstants
+import OpcodeTable
+import LinSegments
+
+# Module: RangeSplitter
+
+# The opcode (after decoding, unknown bytes are INVALID) of each byte.
+CODES = bytes(op.opcode for op in OpcodeTable.OPCODES)
+EFFECTS = OpcodeTable.EFFECTS
+JUMPDEST = EVMConstants.default__.JUMPDEST
+TERMINAL = frozenset(b for b in range(256) if OpcodeTable.OPCODES[b].IsTerminal())
+
+# The kind of segment that ends with a given opcode, as in Splitter.BuildSeg.
+KINDS = {
+    EVMConstants.default__.JUMP: LinSegments.LinSeg_JUMPSeg,
+    EVMConstants.default__.JUMPI: LinSegments.LinSeg_JUMPISeg,
+    EVMConstants.default__.RETURN: LinSegments.LinSeg_RETURNSeg,
+    EVMConstants.default__.REVERT: LinSegments.LinSeg_STOPSeg,
+    EVMConstants.default__.STOP: LinSegments.LinSeg_STOPSeg,
+    EVMConstants.default__.INVALID: LinSegments.LinSeg_INVALIDSeg,
+}
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Boundaries(store):
+        """
+        The segments of store as a list of (start, end, netOpEffect), with
+        the same boundaries as Splitter.SplitUpToTerminal.
+        """
+        ops = store.ops
+        n = len(ops)
+        segs = []
+        start = 0
+        effect = 0
+        for i in range(n):
+            b = ops[i]
+            if b == JUMPDEST and i > start:
+                segs.append((start, i, effect))
+                start = i
+                effect = 0
+            effect += EFFECTS[b]
+            if b in TERMINAL:
+                segs.append((start, i + 1, effect))
+                start = i + 1
+                effect = 0
+        if start < n:
+            segs.append((start, n, effect))
+        return segs
+
+    @staticmethod
+    def Split(store):
+        """
+        The segments of store, same as Splitter.SplitUpToTerminal(store.ToSeq(), [], []).
+        """
+        segs = []
+        for start, end, effect in default__.Boundaries(store):
+            kind = KINDS.get(CODES[store.ops[end - 1]], LinSegments.LinSeg_CONTSeg)
+            segs.append(kind(store.Range(start, end - 1), store.Instruction(end - 1), effect))
+        return _dafny.SeqWithoutIsStrInference(segs)
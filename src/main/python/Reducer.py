@@ -0,0 +1,290 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Minimisation of the CFG during the exploration.
+# EVMObj.BuildCFG builds the whole automaton (nonMinimisedSize) and then
+# minimises it: the classes are the states of the same segment (each error
+# state on its own) refined by the classes of their successors.
+# A Reducer is given to Explorer.Explore instead of an AutoBuilder. It
+# numbers the states found (ids) but only keeps the successors of the
+# states of the strongly connected components (SCCs) that are not complete
+# (Tarjan's algorithm, with the Enter and Leave calls of Explore). When an
+# SCC is complete, the classes of all the states it can reach are known,
+# so its states get their final classes:
+# - a state of a trivial SCC is in the class with the same segment and
+#   classes of successors (a table of the signatures of the classes), or
+#   in a new class;
+# - the states of an SCC with a loop are either all in existing classes
+#   (the classes are found from one state, as the successors are
+#   deterministic), or the SCC is minimised (HopcroftMinimiser.Refine)
+#   into new classes.
+# The classes are those of the minimisation of the whole automaton, and
+# Freeze builds the same automaton as GStateMinimiser.Pair.MapToClasses
+# (the representative of a class is its smallest id).
+# The visited states are kept (to explore the same states as BuildCFG),
+# with one class per id, but the edges are only kept per class. This does
+# not lower the peak memory much: most states are the representatives of
+# their classes, which are kept for Freeze.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import CFGState
+import Statistics
+import EVMObject
+import AutoBuilder
+import HopcroftMinimiser
+import Explorer
+
+# Module: Reducer
+
+class Reducer:
+    """
+    The minimised automaton of the states and edges found so far.
+    ids[s] is the id of state s and classOf[k] the class of id k (None
+    until its SCC is complete). succs, low and states are the successors,
+    Tarjan's low link and the state of the ids of the incomplete SCCs,
+    open their stack and at[k] the position of k in open, entered the ids
+    being explored and new the id added by the last AddEdge if it is not
+    explored yet.
+    keys, classSuccs, reps and repStates are the Key (the segment, or the
+    id of an error state), the classes of the successors, the smallest id
+    and its state of each class. sigs maps (key, classSuccs) to its class, byKey
+    maps (key, number of successors) to the classes.
+    """
+    def  __init__(self):
+        self.ids = {}
+        self.classOf = []
+        self.edges = 0
+        self.succs = {}
+        self.low = {}
+        self.states = {}
+        self.open = []
+        self.at = {}
+        self.entered = []
+        self.new = None
+        self.keys = []
+        self.classSuccs = []
+        self.reps = []
+        self.repStates = []
+        self.sigs = {}
+        self.byKey = {}
+
+    def __contains__(self, s):
+        return s in self.ids
+
+    def SSize(self):
+        """
+        The number of states of the non minimised automaton.
+        """
+        return len(self.classOf)
+
+    def TSize(self):
+        """
+        The number of edges of the non minimised automaton.
+        """
+        return self.edges
+
+    def AddState(self, s):
+        k = self.ids.get(s)
+        if k is None:
+            self.Settle()
+            k = len(self.classOf)
+            self.ids[s] = k
+            self.classOf.append(None)
+            self.succs[k] = []
+            self.low[k] = k
+            self.states[k] = s
+            self.at[k] = len(self.open)
+            self.open.append(k)
+            self.new = k
+        return k
+
+    def AddEdge(self, s, t):
+        self.Settle()
+        k = self.ids[s]
+        l = self.ids.get(t)
+        if l is None:
+            l = self.AddState(t)
+        elif self.classOf[l] is None:
+            self.low[k] = min(self.low[k], l)
+        if l not in self.succs[k]:
+            self.succs[k].append(l)
+            self.edges += 1
+
+    def Enter(self, s):
+        self.new = None
+        self.entered.append(self.ids[s])
+
+    def Leave(self, s):
+        self.Settle()
+        k = self.entered.pop()
+        if self.entered:
+            parent = self.entered[-1]
+            self.low[parent] = min(self.low[parent], self.low[k])
+        if self.low[k] == k:
+            j = self.at[k]
+            members = self.open[j:]
+            del self.open[j:]
+            self.Complete(members)
+
+    def Settle(self):
+        """
+        Complete the SCC of new: it is not explored.
+        """
+        if self.new is not None:
+            k = self.new
+            self.new = None
+            self.open.pop()
+            self.Complete([k])
+
+    def Key(self, k):
+        """
+        The segment of the state of k. Each error state is in its own class.
+        """
+        s = self.states[k]
+        return s.segNum if s.is_EGState else ("err", k)
+
+    def AddClass(self, key, succs, k):
+        c = len(self.keys)
+        self.keys.append(key)
+        self.classSuccs.append(succs)
+        self.reps.append(k)
+        self.repStates.append(self.states[k])
+        self.sigs[(key, succs)] = c
+        self.byKey.setdefault((key, len(succs)), []).append(c)
+        return c
+
+    def Join(self, k, c):
+        self.classOf[k] = c
+        if k < self.reps[c]:
+            self.reps[c] = k
+            self.repStates[c] = self.states[k]
+
+    def Follow(self, inside, m0, d):
+        """
+        The classes of the states of inside (an SCC) if m0 is in class d,
+        or None if they do not match the existing classes.
+        """
+        phi = {m0: d}
+        todo = [m0]
+        while todo:
+            m = todo.pop()
+            c = phi[m]
+            if self.keys[c] != self.Key(m) or len(self.classSuccs[c]) != len(self.succs[m]):
+                return None
+            for t, e in zip(self.succs[m], self.classSuccs[c]):
+                if t not in inside:
+                    if self.classOf[t] != e:
+                        return None
+                elif t not in phi:
+                    phi[t] = e
+                    todo.append(t)
+                elif phi[t] != e:
+                    return None
+        return phi
+
+    def Match(self, members):
+        """
+        The classes of members (an SCC) if they are in existing classes,
+        or None.
+        """
+        inside = set(members)
+        m0 = members[0]
+        for d in self.byKey.get((self.Key(m0), len(self.succs[m0])), ()):
+            phi = self.Follow(inside, m0, d)
+            if phi is not None:
+                return phi
+        return None
+
+    def Split(self, members):
+        """
+        Add the classes of the minimisation of members (an SCC that is
+        not in existing classes, in increasing order).
+        """
+        index = {m: i for i, m in enumerate(members)}
+        rows = []
+        blocks = {}
+        for i, m in enumerate(members):
+            rows.append([index[t] for t in self.succs[m] if t in index])
+            sig = tuple(None if t in index else self.classOf[t] for t in self.succs[m])
+            blocks.setdefault((self.Key(m), sig), []).append(i)
+        blockOf = HopcroftMinimiser.default__.Refine(rows, list(blocks.values()))
+        # The smallest member of each block, and the new class of each block.
+        reps = {}
+        for i, m in enumerate(members):
+            reps.setdefault(blockOf[i], m)
+        classes = {b: len(self.keys) + j for j, b in enumerate(reps)}
+        for i, m in enumerate(members):
+            self.classOf[m] = classes[blockOf[i]]
+        for m in reps.values():
+            self.AddClass(self.Key(m), tuple(self.classOf[t] for t in self.succs[m]), m)
+
+    def Complete(self, members):
+        """
+        Give their classes to members (a complete SCC).
+        """
+        if len(members) == 1 and members[0] not in self.succs[members[0]]:
+            k = members[0]
+            key = self.Key(k)
+            succs = tuple(self.classOf[t] for t in self.succs[k])
+            c = self.sigs.get((key, succs))
+            if c is None:
+                c = self.AddClass(key, succs, k)
+            self.Join(k, c)
+        else:
+            phi = self.Match(members)
+            if phi is None:
+                self.Split(members)
+            else:
+                for k in members:
+                    self.Join(k, phi[k])
+        for k in members:
+            del self.succs[k]
+            del self.low[k]
+            del self.states[k]
+            del self.at[k]
+
+    def Freeze(self):
+        """
+        The minimised automaton (the exploration ends).
+        """
+        self.Settle()
+        while self.entered:
+            self.Leave(None)
+        b = AutoBuilder.AutoBuilder()
+        for c in self.classOf:
+            src = self.repStates[c]
+            for t in self.classSuccs[c]:
+                b.AddEdge(src, self.repStates[t])
+            b.AddState(src)
+        return b.Freeze()
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def BuildCFG(prog, maxDepth, project=None, budget=None):
+        """
+        Same as Explorer.default__.BuildCFG(prog, maxDepth, True, project,
+        budget), with the minimisation done during the exploration.
+        """
+        init = CFGState.default__.DEFAULT__GSTATE
+        r = Reducer()
+        r.AddState(init)
+        p0 = EVMObject.Path_Path(_dafny.SeqWithoutIsStrInference([init]), _dafny.SeqWithoutIsStrInference([]))
+        s1 = Explorer.default__.Explore(prog, p0, r, maxDepth, Statistics.Stats_Stats(False, 0, 0, 0, (0, 0)), project, None, budget)
+        a = r.Freeze()
+        return a, Explorer.default__.Stats(Statistics.Stats_Stats(s1.maxDepthReached, s1.visitedStates, s1.wPreInvSuccess, s1.errorState, (r.SSize(), r.TSize())), **s1.__dict__)
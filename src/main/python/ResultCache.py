@@ -0,0 +1,151 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# On-disk cache of CFG results in a SQLite file.
+# An entry is keyed by the sha256 of the bytecode and the options that
+# change the result (max depth, minimise, notable, fancy, stack abstraction).
+# It holds the segments, the automaton, the stats (with the number of
+# states merged by the stack abstraction, and the budget exceeded: partial
+# results are not stored) and the rendered outputs (DOT), pickled and
+# compressed (see Pickling). Entries are evicted least recently used first when the
+# file is larger than maxBytes. The CFGs are built by the callers (see
+# evmdis.BuildCFG).
+# This file is copied into the output of the Dafny python generator.
+import time
+import sqlite3
+import hashlib
+
+import module_
+import _dafny
+import System_
+import Pickling
+import StackAbstraction
+
+# Module: ResultCache
+
+SCHEMA = """
+create table if not exists entries (key text primary key, value blob not null, size integer not null, used real not null);
+create index if not exists entries_used on entries (used);
+create table if not exists counters (name text primary key, value integer not null);
+"""
+
+class ResultCache:
+    """
+    A cache of results in the SQLite file path, at most maxBytes of
+    (compressed) values. hits and misses count the lookups of this instance,
+    Stats() adds the totals over all the users of the file.
+    """
+    def  __init__(self, path, maxBytes):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.executescript(SCHEMA)
+
+    def __contains__(self, key):
+        return self.db.execute("select 1 from entries where key = ?", (key,)).fetchone() is not None
+
+    def Get(self, key):
+        """
+        The value of key, or None.
+        """
+        row = self.db.execute("select value from entries where key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            self.Count("misses")
+            return None
+        self.hits += 1
+        self.Count("hits")
+        self.db.execute("update entries set used = ? where key = ?", (time.time(), key))
+        return Pickling.Loads(row[0])
+
+    def Put(self, key, value):
+        blob = Pickling.Dumps(value)
+        with self.db:
+            self.db.execute("insert or replace into entries values (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+        self.Evict()
+
+    def Evict(self):
+        """
+        Remove the least recently used entries until the size is at most maxBytes.
+        """
+        with self.db:
+            total = self.db.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+            rows = self.db.execute("select key, size from entries order by used") if total > self.maxBytes else []
+            evict = []
+            for key, size in rows:
+                if total <= self.maxBytes:
+                    break
+                evict.append((key,))
+                total -= size
+            self.db.executemany("delete from entries where key = ?", evict)
+            if evict:
+                self.Count("evictions", len(evict))
+
+    def Count(self, name, n=1):
+        self.db.execute("insert into counters values (?, ?) on conflict (name) do update set value = value + ?", (name, n, n))
+
+    def Stats(self):
+        counters = dict(self.db.execute("select name, value from counters"))
+        entries, size = self.db.execute("select count(*), coalesce(sum(size), 0) from entries").fetchone()
+        return {"hits": self.hits, "misses": self.misses,
+                "totalHits": counters.get("hits", 0), "totalMisses": counters.get("misses", 0),
+                "evictions": counters.get("evictions", 0), "entries": entries, "bytes": size}
+
+    def Close(self):
+        self.db.close()
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Key(code, maxDepth, minimise, notable, fancy, abstract=False):
+        """
+        The key of the results for code (bytes) and the options.
+        """
+        return "%s:%d:%d:%d:%d:%d" % (hashlib.sha256(code).hexdigest(), maxDepth, minimise, notable, fancy, abstract * StackAbstraction.VERSION)
+
+    @staticmethod
+    def Entry(cache, key, prog, build, store=True):
+        """
+        The entry of key: a dict with the segments of prog, the automaton
+        ("auto") and the stats (an Explorer.Stats) returned by build(), and
+        the rendered "outputs".
+        build is only called if cache is None or key is not in the cache.
+        The entry is then stored in the cache if store and the CFG is not
+        partial (stats.budget is None).
+        """
+        entry = cache.Get(key) if cache is not None else None
+        if entry is None:
+            a, stats = build()
+            entry = {"segments": prog.xs, "auto": a, "stats": stats, "outputs": {}}
+            if cache is not None and store and stats.budget is None:
+                cache.Put(key, entry)
+        return entry
+
+    @staticmethod
+    def Render(cache, key, entry, name, render):
+        """
+        The output name of entry, the str lines of render() if it is not
+        cached. The output is stored with the entry if key is in the cache.
+        """
+        out = entry["outputs"].get(name)
+        if out is None:
+            out = "".join(render())
+            entry["outputs"][name] = out
+            if cache is not None and key in cache:
+                cache.Put(key, entry)
+        return out
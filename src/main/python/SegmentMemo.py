@@ -0,0 +1,202 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Memoisation of the segment summaries.
+# LinSeg.WeakestPreOperands, LinSeg.WeakestPreCapacity and
+# SegBuilder.JUMPResolver only depend on the instructions of a segment,
+# not on their addresses. They are computed at each call (per automaton
+# state in ComputeWPreOperands, per segment in the proof object and DOT
+# renderers) by recursions that copy the instruction Seq at each step.
+# Install() replaces them by lookups in process-wide tables keyed by the
+# structure of the instructions: the opcodes for the weakest preconditions
+# (they only depend on the stack effects and minimum operands/capacity of
+# the opcodes), the opcodes and arguments for JUMPResolver. Segments that
+# are EquivSeg have the same opcodes and share their weakest preconditions.
+# The keys of a segment are computed once and kept on it (from the arrays
+# of the store for the InstructionRange segments, without building their
+# instructions), and LinSeg.Ins is kept too, so that the calls on s.Ins()
+# find the key of s.
+# The tables are shared by all the contracts analysed by a process and
+# the least recently used entries are removed first.
+# This file is copied into the output of the Dafny python generator.
+from collections import OrderedDict
+
+import module_
+import _dafny
+import System_
+import LinSegments
+import SegBuilder
+import InstructionStore
+
+# Module: SegmentMemo
+
+# Max number of entries of a table.
+MAXSIZE = 1 << 16
+
+class Counter:
+    """
+    The hits and misses of the lookups of a user of the tables.
+    """
+    def  __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+class Memo:
+    """
+    An LRU table of results with hit/miss counters.
+    """
+    def  __init__(self, name, maxSize = MAXSIZE):
+        self.name = name
+        self.maxSize = maxSize
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def Get(self, key, compute, counter = None):
+        """
+        The result of key, compute() if it is not in the table. The hit or
+        miss is counted by counter too if it is not None.
+        """
+        r = self.table.get(key)
+        if r is None:
+            self.misses += 1
+            if counter is not None:
+                counter.misses += 1
+            r = compute()
+            self.table[key] = r
+            if len(self.table) > self.maxSize:
+                self.table.popitem(last=False)
+        else:
+            self.hits += 1
+            if counter is not None:
+                counter.hits += 1
+            self.table.move_to_end(key)
+        return r
+
+    def Stats(self):
+        n = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.table),
+                "hitRate": round(self.hits / n, 4) if n > 0 else 0.0}
+
+WPRE_OPERANDS = Memo("WeakestPreOperands")
+WPRE_CAPACITY = Memo("WeakestPreCapacity")
+JUMP_RESOLVER = Memo("JUMPResolver")
+MEMOS = [WPRE_OPERANDS, WPRE_CAPACITY, JUMP_RESOLVER]
+
+def Opcodes(xs):
+    if isinstance(xs, InstructionStore.InstructionRange):
+        return xs.store.ops[xs.start:xs.start + xs.len].tobytes()
+    return bytes(i.op.opcode for i in xs)
+
+def Instructions(xs):
+    """
+    The opcodes and arguments of xs: the bytes of the code of an
+    InstructionRange (and the argument of the malformed last instruction),
+    the tuple of the instructions otherwise.
+    """
+    if isinstance(xs, InstructionStore.InstructionRange):
+        store, end = xs.store, xs.start + xs.len
+        if xs.len == 0:
+            return ("code", b"", None)
+        a = store.addrs[xs.start]
+        b = store.addrs[end] if end < len(store) else len(store.code)
+        tail = store.tailArg.VerbatimString(False) if store.IsTail(end - 1) else None
+        return ("code", bytes(store.code[a:b]), tail)
+    return ("ins", tuple((i.op.opcode, i.arg.VerbatimString(False)) for i in xs))
+
+class Keys:
+    """
+    The Ins() and memo keys of a segment: the opcodes of Ins() and the
+    opcodes and arguments of ins.
+    """
+    def  __init__(self, s):
+        self.ins = default__.AllIns(s)
+        self.opcodes = Opcodes(self.ins)
+        self.instructions = Instructions(s.ins)
+
+# The generated functions, called on a miss.
+GeneratedWeakestPreOperands = LinSegments.LinSeg.WeakestPreOperands
+GeneratedWeakestPreCapacity = LinSegments.LinSeg.WeakestPreCapacity
+GeneratedJUMPResolver = SegBuilder.default__.JUMPResolver
+GeneratedIns = LinSegments.LinSeg.Ins
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def KeysOf(s):
+        """
+        The Keys of segment s, computed on the first call.
+        """
+        k = s.__dict__.get("memoKeys")
+        if k is None:
+            k = Keys(s)
+            s.memoKeys = k
+        return k
+
+    @staticmethod
+    def AllIns(s):
+        """
+        Same as GeneratedIns(s): an InstructionRange if s is a range of a
+        store that ends with lastIns.
+        """
+        xs = s.ins
+        if isinstance(xs, InstructionStore.InstructionRange):
+            end = xs.start + xs.len
+            if end < len(xs.store) and xs.store.addrs[end] == s.lastIns.address and xs.store[end] == s.lastIns:
+                return xs.store.Range(xs.start, end + 1)
+        return GeneratedIns(s)
+
+    @staticmethod
+    def Ins(s):
+        return default__.KeysOf(s).ins
+
+    @staticmethod
+    def WeakestPreOperands(s, xs, postCond):
+        k = default__.KeysOf(s)
+        ops = k.opcodes if xs is k.ins else Opcodes(xs)
+        return WPRE_OPERANDS.Get((ops, postCond), lambda: GeneratedWeakestPreOperands(s, xs, postCond))
+
+    @staticmethod
+    def WeakestPreCapacity(s, n):
+        return WPRE_CAPACITY.Get((default__.KeysOf(s).opcodes, n), lambda: GeneratedWeakestPreCapacity(s, n))
+
+    @staticmethod
+    def JUMPResolver(s):
+        return JUMP_RESOLVER.Get(default__.KeysOf(s).instructions, lambda: GeneratedJUMPResolver(s))
+
+    @staticmethod
+    def Install():
+        """
+        Replace the generated functions by their memoised versions.
+        """
+        LinSegments.LinSeg.Ins = default__.Ins
+        LinSegments.LinSeg.WeakestPreOperands = default__.WeakestPreOperands
+        LinSegments.LinSeg.WeakestPreCapacity = default__.WeakestPreCapacity
+        SegBuilder.default__.JUMPResolver = staticmethod(default__.JUMPResolver)
+
+    @staticmethod
+    def Stats():
+        """
+        The hits, misses, size and hit rate of each table.
+        """
+        return {m.name: m.Stats() for m in MEMOS}
+
+    @staticmethod
+    def Counts():
+        """
+        The total number of hits and misses.
+        """
+        return sum(m.hits for m in MEMOS), sum(m.misses for m in MEMOS)
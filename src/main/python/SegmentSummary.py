@@ -0,0 +1,190 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Compiled segment bodies.
+# LinSeg.Run executes the instructions of a segment (but the last one) with
+# LinSegments.RunIns: one Instruction.NextState per instruction, each a
+# long match on the opcode that builds a new state and stack.
+# A Summary is the effect of a sequence of instructions on the abstract
+# stack, computed once: the min stack size that avoids an error, the number
+# of elements popped, the elements pushed (input positions or constants)
+# and the pc increment. Applying it is a single stack operation.
+# Install() replaces RunIns (used by LinSeg.Run, so by NextG, RunAll and
+# PreservesCond). The summary of an instruction sequence is kept on it
+# (with the jumpDests it was compiled for), so it lives as long as the
+# segment. States with a stack smaller than the min size, and sequences
+# with instructions that always fail, are run by the generated RunIns, so
+# the errors are the same.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import EVMConstants
+import State
+import StackElement
+import Instructions
+import LinSegments
+import HashCons
+
+# Module: SegmentSummary
+
+class Summary:
+    """
+    The effect of a sequence of instructions: on a stack of size at least
+    need, pops elements, pushes outputs (top first; an int k is the k-th
+    element of the input stack, other outputs are stack elements) and adds
+    skip to the pc. width is the number of input elements that are read.
+    """
+    def  __init__(self, need, pops, outputs, skip):
+        self.need = need
+        self.pops = pops
+        self.outputs = outputs
+        self.skip = skip
+        self.width = max([pops] + [k + 1 for k in outputs if isinstance(k, int)])
+
+    def Apply(self, s):
+        st = HashCons.default__.FromSeq(s.stack)
+        inputs = []
+        t = st
+        for _ in range(self.width):
+            inputs.append(t.top)
+            t = t.rest
+        r = st.Drop(self.pops)
+        for e in reversed(self.outputs):
+            r = HashCons.Cons(inputs[e] if isinstance(e, int) else e, r)
+        return State.AState_EState(s.pc + self.skip, r)
+
+class Compiler:
+    """
+    The symbolic stack of a sequence of instructions: stack (top first)
+    is above the input stack without its base first elements.
+    """
+    def  __init__(self):
+        self.stack = []
+        self.base = 0
+        self.need = 0
+        self.skip = 0
+
+    def Require(self, n):
+        self.need = max(self.need, n - len(self.stack) + self.base)
+
+    def Get(self, k):
+        return self.stack[k] if k < len(self.stack) else self.base + k - len(self.stack)
+
+    def Pop(self, n):
+        for _ in range(n):
+            if self.stack:
+                self.stack.pop(0)
+            else:
+                self.base += 1
+
+    def Push(self, e, n=1):
+        self.stack[0:0] = [e] * n
+
+    def Step(self, i, jumpDests):
+        """
+        Add the effect of instruction i. False if it always fails (or is
+        not a body instruction).
+        """
+        op = i.op
+        opcode = op.opcode
+        c = EVMConstants.default__
+        if op.is_ArithOp or op.is_CompOp or op.is_BitwiseOp or op.is_EnvOp or op.is_MemOp or op.is_StorageOp:
+            self.Require(op.pops)
+            self.Pop(op.pops)
+            self.Push(HashCons.RANDOM, op.pushes)
+        elif op.is_KeccakOp:
+            self.Require(2)
+            self.Pop(2)
+            self.Push(HashCons.RANDOM)
+        elif op.is_JumpOp:
+            if opcode != c.JUMPDEST:
+                return False
+        elif op.is_RunOp:
+            self.Push(HashCons.RANDOM)
+        elif op.is_StackOp:
+            if opcode == c.POP:
+                self.Require(1)
+                self.Pop(1)
+            elif c.PUSH0 <= opcode <= c.PUSH32:
+                v = Instructions.default__.GetArgValuePush(i.arg)
+                self.Push(StackElement.StackElem_Value(v) if v in jumpDests else HashCons.RANDOM)
+                self.skip += opcode - c.PUSH0
+            elif c.DUP1 <= opcode <= c.DUP16:
+                n = opcode - c.DUP1 + 1
+                self.Require(n)
+                self.Push(self.Get(n - 1))
+            elif c.SWAP1 <= opcode <= c.SWAP16:
+                n = opcode - c.SWAP1 + 1
+                self.Require(n + 1)
+                while len(self.stack) <= n:
+                    self.stack.append(self.base)
+                    self.base += 1
+                self.stack[0], self.stack[n] = self.stack[n], self.stack[0]
+            else:
+                return False
+        elif op.is_LogOp:
+            self.Require(op.pops)
+            self.Pop(op.pops)
+        else:
+            if opcode in (c.INVALID, c.STOP, c.REVERT):
+                return False
+            self.Require(op.pops)
+            self.Pop(op.pops)
+            self.Push(HashCons.RANDOM, op.pushes)
+        self.skip += 1
+        return True
+
+# The generated RunIns.
+GeneratedRunIns = LinSegments.default__.RunIns
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Compile(xs, jumpDests):
+        """
+        The Summary of the instructions xs, or None if one of them always fails.
+        """
+        c = Compiler()
+        for i in xs:
+            if not c.Step(i, jumpDests):
+                return None
+        return Summary(c.need, c.base, c.stack, c.skip)
+
+    @staticmethod
+    def Get(xs, jumpDests):
+        """
+        The Summary of xs, compiled on the first call.
+        """
+        r = xs.__dict__.get("summary")
+        if r is None or r[0] is not jumpDests:
+            r = (jumpDests, default__.Compile(xs, jumpDests))
+            xs.summary = r
+        return r[1]
+
+    @staticmethod
+    def RunIns(xs, s, jumpDests):
+        """
+        Same as LinSegments.RunIns(xs, s, jumpDests).
+        """
+        summary = default__.Get(xs, jumpDests)
+        if summary is None or not s.is_EState or s.Size() < summary.need:
+            return GeneratedRunIns(xs, s, jumpDests)
+        return summary.Apply(s)
+
+    @staticmethod
+    def Install():
+        LinSegments.default__.RunIns = staticmethod(default__.RunIns)
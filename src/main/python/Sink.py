@@ -0,0 +1,120 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Output sinks.
+# The generated printers (proof object, --info, ...) write to stdout with
+# _dafny.print, one builtins.print per token.
+# A sink is any object with a write(str) method: a text file, stdout, a
+# gzip file, a binary stream (BytesIO) wrapped by Text, or a NullSink.
+# Open returns the sink of a path, and To sends the output of _dafny.print
+# to a sink, in chunks, within a with block. The renderers that produce
+# str lines (Listing, Dot) write to the sink directly.
+# This file is copied into the output of the Dafny python generator.
+import io
+import sys
+import gzip
+import contextlib
+
+import module_
+import _dafny
+import System_
+
+# Module: Sink
+
+class NullSink:
+    """
+    A sink that discards its output.
+    """
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class Buffer:
+    """
+    A sink that writes to out when chunk characters are buffered (and
+    when flushed).
+    """
+    def  __init__(self, out, chunk = 1 << 16):
+        self.out = out
+        self.chunk = chunk
+        self.buf = []
+        self.size = 0
+
+    def write(self, s):
+        self.buf.append(s)
+        self.size += len(s)
+        if self.size >= self.chunk:
+            self.flush()
+        return len(s)
+
+    def Print(self, value):
+        """
+        Same as _dafny.print(value), to this sink.
+        """
+        self.write(value if isinstance(value, str) else str(value))
+
+    def flush(self):
+        if self.buf:
+            self.out.write("".join(self.buf))
+            self.buf.clear()
+            self.size = 0
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Text(stream):
+        """
+        stream if it is a text stream, else the UTF-8 text stream of the
+        binary stream (e.g. a BytesIO or a gzip.GzipFile).
+        """
+        if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+            return io.TextIOWrapper(stream, encoding="utf-8")
+        return stream
+
+    @staticmethod
+    def Open(path, compress = False):
+        """
+        The sink of path: stdout for "-", a NullSink for None, a gzip file
+        if compress or path ends with ".gz", a text file otherwise.
+        """
+        if path is None:
+            return NullSink()
+        if path == "-":
+            return sys.stdout
+        if compress or path.endswith(".gz"):
+            return gzip.open(path, "wt", compresslevel=6, encoding="utf-8")
+        return open(path, "w", buffering=1 << 20)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def To(out):
+        """
+        Send the output of _dafny.print to out in the with block. The block
+        gets the Buffer used, so that it can be written to in order.
+        """
+        b = Buffer(out)
+        old = _dafny.print
+        _dafny.print = b.Print
+        try:
+            yield b
+        finally:
+            _dafny.print = old
+            b.flush()
@@ -0,0 +1,224 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Stack abstraction for the CFG exploration.
+# The states that reach a segment with stacks that only differ by Values
+# that are never used as jump targets (the dead positions) are merged.
+# Liveness computes, for each segment, the positions of the stack on entry
+# that can still be the target of a jump: the target of its own jump
+# (SegBuilder.JUMPResolver) and the positions that are moved (as in
+# Instructions.StackPosBackWardTracker, with the SegmentSummary of the
+# segment) to a live position of a successor. The successors of a jump to
+# a position of the stack are not known before the exploration, so all the
+# positions that are left on the stack by such a jump are live. The live
+# positions of a segment are a set and a threshold (all the positions at
+# or below it).
+# Projection replaces the Values at the other positions by the canonical
+# unknown element Random(""). The heights of the stacks are unchanged, so
+# the resolved jumps and the stack underflows are the same, and the
+# minimised CFG is the same as without the projection (when the max depth
+# is not reached). The number of states that were merged is in the stats
+# (Stats).
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import CFGState
+import Statistics
+import SegBuilder
+import SegmentSummary
+import HashCons
+import Explorer
+
+# Module: StackAbstraction
+
+# The version of the projection, in the keys of the cache and checkpoints.
+VERSION = 2
+
+# The max height of the EVM stack: deeper live positions are a threshold.
+HEIGHT = 1024
+
+# The threshold of the segments with no live positions below the set.
+NONE = float("inf")
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+class Stats(Explorer.Stats):
+    """
+    The stats of an exploration with the number of merged states
+    (mergedStates).
+    """
+    def PrettyPrint(self):
+        return super().PrettyPrint() + ToSeq("Merged states:" + str(self.mergedStates) + "\n")
+
+class Transfer:
+    """
+    The positions on entry of a segment of the positions on exit (on entry
+    of its successors): exit position q < len(outs) is outs[q] (None if it
+    is a constant of the segment), q >= len(outs) is q + shift.
+    """
+    def  __init__(self, outs, shift):
+        self.outs = outs
+        self.shift = shift
+
+    def Back(self, q):
+        return self.outs[q] if q < len(self.outs) else q + self.shift
+
+class Liveness:
+    """
+    live[k] is (positions, threshold): the live positions on entry of
+    segment k are the positions in the set and those >= threshold.
+    """
+    def  __init__(self, prog):
+        xs = prog.xs
+        n = len(xs)
+        self.gen = [frozenset()] * n
+        self.succs = [[] for _ in range(n)]
+        self.anySucc = [False] * n
+        self.transfers = [None] * n
+        for k in range(n):
+            self.Edges(prog, k)
+        preds = [[] for _ in range(n)]
+        for k in range(n):
+            for j in self.succs[k]:
+                preds[j].append(k)
+        self.live = [(self.gen[k], NONE) for k in range(n)]
+        todo = set(range(n))
+        while todo:
+            k = todo.pop()
+            r = self.Entry(k)
+            if r != self.live[k]:
+                self.live[k] = r
+                todo.update(preds[k])
+
+    def Edges(self, prog, k):
+        """
+        The jump target position, the successors and the Transfer of segment k.
+        """
+        s = prog.xs[k]
+        pops = 0
+        if s.is_JUMPSeg or s.is_JUMPISeg:
+            pops = 1 if s.is_JUMPSeg else 2
+            r = SegBuilder.default__.JUMPResolver(s)
+            if r.is_Right:
+                self.gen[k] = frozenset([r.r])
+                self.anySucc[k] = True
+            elif r.l.is_Value and r.l.v in prog.PCToSegMap:
+                self.succs[k].append(prog.PCToSegMap[r.l.v])
+        if (s.is_JUMPISeg or s.is_CONTSeg) and k + 1 < len(prog.xs):
+            self.succs[k].append(k + 1)
+        if not (self.succs[k] or self.anySucc[k]):
+            return
+        summary = SegmentSummary.default__.Get(s.Ins() if s.is_CONTSeg else s.ins, prog.jumpDests)
+        if summary is None:
+            # Not summarised: all the positions are live.
+            return
+        outs = [e if isinstance(e, int) else None for e in summary.outputs[pops:]]
+        self.transfers[k] = Transfer(outs, pops - len(summary.outputs) + summary.pops)
+
+    def Entry(self, k):
+        """
+        The live positions on entry of k, from those of its successors.
+        """
+        tr = self.transfers[k]
+        if tr is None:
+            if self.succs[k] or self.anySucc[k]:
+                return frozenset(), 0
+            return self.gen[k], NONE
+        positions = set(self.gen[k])
+        t = NONE
+        outs = [self.live[j] for j in self.succs[k]]
+        if self.anySucc[k]:
+            outs.append((frozenset(), 0))
+        for ps, tj in outs:
+            for q in ps:
+                p = tr.Back(q)
+                if p is not None:
+                    positions.add(p)
+            if tj != NONE:
+                for q in range(tj, len(tr.outs)):
+                    p = tr.Back(q)
+                    if p is not None:
+                        positions.add(p)
+                t = min(t, max(tj, len(tr.outs)) + tr.shift)
+        if positions and max(positions) >= HEIGHT:
+            t = min(t, HEIGHT)
+        return frozenset(p for p in positions if p < t), t
+
+class Projection:
+    """
+    The projection of the states of prog. merged is the number of states
+    that were mapped to a state that had already been found.
+    """
+    def  __init__(self, prog):
+        self.live = Liveness(prog).live
+        # (segment, stack) -> projected stack. Stacks are interned.
+        self.stacks = {}
+        self.seen = set()
+        self.found = set()
+        self.merged = 0
+
+    def Stack(self, k, st):
+        """
+        The stack st (a Stack) on entry of segment k, with Random for the
+        Values at dead positions.
+        """
+        r = self.stacks.get((k, st))
+        if r is not None:
+            return r
+        positions, t = self.live[k]
+        top = []
+        dead = -1
+        s = st
+        while s.rest is not None and len(top) < t:
+            if s.top.is_Value and len(top) not in positions:
+                dead = len(top)
+            top.append(s.top)
+            s = s.rest
+        r = st
+        if dead >= 0:
+            r = st.Drop(dead + 1)
+            for p in range(dead, -1, -1):
+                e = top[p]
+                r = HashCons.Cons(HashCons.RANDOM if e.is_Value and p not in positions else e, r)
+        self.stacks[(k, st)] = r
+        return r
+
+    def Project(self, g):
+        if g.is_ErrorGState:
+            return g
+        st = HashCons.default__.FromSeq(g.st)
+        r = self.Stack(g.segNum, st)
+        h = g if r is st else CFGState.GState_EGState(g.segNum, r)
+        if g not in self.seen:
+            self.seen.add(g)
+            if h in self.found:
+                self.merged += 1
+            self.found.add(h)
+        return h
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Stats(stats, merged):
+        """
+        stats with the number of merged states.
+        """
+        r = Stats(*stats)
+        r.__dict__.update(stats.__dict__)
+        r.mergedStates = merged
+        return r
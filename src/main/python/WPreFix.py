@@ -0,0 +1,114 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Worklist fixpoints of the weakest preconditions on the stack size.
+# EVMObj.Fix (used by ComputeWPreOperands for the DOT output) runs up to
+# len(states) + 1 rounds, and each round scans all the states (UpdateValues)
+# to update the scheduled ones, appending the values to a new Seq and the
+# predecessors of the changed ones to a new Set. The initial Set of all the
+# states is built one union at a time.
+# Fix below keeps the values in a list and only visits the scheduled states
+# of each round (the worklist), with their predecessors (PredNat) scheduled
+# for the next round when their value increases. The rounds are the same as
+# in EVMObj.Fix (a state is updated with the values of the previous round),
+# so the results, and whether the fixpoint is reached within maxIter rounds,
+# are the same.
+# CFGStateAutomata.Auto.Fix2 has the same rounds and is replaced too.
+# The results (Either) have the number of values computed (the node
+# updates) of their fixpoint in updates.
+# Install() replaces EVMObj.Fix, EVMObj.ComputeWPreOperands and Auto.Fix2.
+# This file is copied into the output of the Dafny python generator.
+import module_
+import _dafny
+import System_
+import MiscTypes
+import EVMObject
+import CFGStateAutomata
+
+# Module: WPreFix
+
+def Result(r, updates):
+    """
+    The result r of a fixpoint with its number of node updates.
+    """
+    r.updates = updates
+    return r
+
+class default__:
+    def  __init__(self):
+        pass
+
+    @staticmethod
+    def Fix(prog, a, wpre0, xu, xc, maxIter):
+        """
+        Same as EVMObj.Fix(a, wpre0, xu, xc, maxIter) on prog.
+        """
+        xs = prog.xs
+        values = list(xc)
+        todo = set(xu)
+        n = 0
+        while todo:
+            if maxIter == 0:
+                return Result(MiscTypes.Either_Right(_dafny.SeqWithoutIsStrInference(values)), n)
+            updates = []
+            scheduled = set()
+            for i in todo:
+                m = max((values[j] for j in a.SuccNat(i)), default=0)
+                d = xs[a.states[i].segNum].FastWeakestPreOperands(m, wpre0[i])
+                updates.append((i, d))
+                if d > values[i]:
+                    scheduled.update(a.PredNat(i))
+            for i, d in updates:
+                values[i] = d
+            n += len(updates)
+            todo = scheduled
+            maxIter -= 1
+        return Result(MiscTypes.Either_Left(_dafny.SeqWithoutIsStrInference(values)), n)
+
+    @staticmethod
+    def ComputeWPreOperands(prog, a):
+        """
+        Same as EVMObj.ComputeWPreOperands(a) on prog.
+        """
+        xs = prog.xs
+        wpre0 = _dafny.SeqWithoutIsStrInference([xs[s.segNum].WeakestPreOperands(xs[s.segNum].Ins(), 0) for s in a.states])
+        return default__.Fix(prog, a, wpre0, range(len(a.states)), wpre0, len(a.states) + 1)
+
+    @staticmethod
+    def Fix2(a, xu, xs, maxIter, f):
+        """
+        Same as CFGStateAutomata.Auto.Fix2(xu, xs, maxIter, f) on a.
+        """
+        todo = set(xu)
+        n = 0
+        while todo:
+            if maxIter == 0:
+                return Result(MiscTypes.Either_Right(xs), n)
+            updates = [(i, f(i, xs)) for i in todo]
+            values = list(xs)
+            todo = set()
+            for i, v in updates:
+                if v != values[i]:
+                    values[i] = v
+                    todo.add(i)
+            n += len(updates)
+            xs = _dafny.SeqWithoutIsStrInference(values)
+            maxIter -= 1
+        return Result(MiscTypes.Either_Left(xs), n)
+
+    @staticmethod
+    def Install():
+        EVMObject.EVMObj.Fix = default__.Fix
+        EVMObject.EVMObj.ComputeWPreOperands = default__.ComputeWPreOperands
+        CFGStateAutomata.Auto.Fix2 = default__.Fix2
@@ -0,0 +1,200 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Python driver with the same options as Driver.dfy.
+# The bytecode can be given as the last argument (as for Driver.Main), or
+# read from a file (--input) or stdin (--stdin), as hex text or raw bytes
+# (--binary). Files are mapped and decoded once, so large contracts do not
+# go through argv or a Seq of characters.
+# This file is copied into the output of the Dafny python generator.
+# Usage: python3 build/libs/driver-py/evmdis.py [options] (<string> | --input FILE | --stdin)
+import sys
+import argparse
+import itertools
+
+import module_
+import _dafny
+import System_
+import InputReader
+import InstructionStore
+import Listing
+import Dot
+import Sink
+import PrettyPrinters
+import ProofObjectBuilder
+import CFGObject
+import ResultCache
+import Checkpoint
+import Explorer
+import StackAbstraction
+import ParallelExplorer
+import Reducer
+import Patches
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+def Options(argv):
+    parser = argparse.ArgumentParser(prog="evmdis", description="EVM bytecode disassembler and CFG generator")
+    parser.add_argument("string", nargs="?", help="The bytecode as an hex string")
+    parser.add_argument("--input", metavar="FILE", help="Read the bytecode from FILE")
+    parser.add_argument("--stdin", action="store_true", help="Read the bytecode from stdin")
+    parser.add_argument("-b", "--binary", action="store_true", help="The input (FILE or stdin) is raw bytes, not hex")
+    parser.add_argument("-d", "--dis", action="store_true", help="Disassemble <string>")
+    parser.add_argument("-p", "--proof", action="store_true", help="Generate proof object for <string>")
+    parser.add_argument("-s", "--segment", action="store_true", help="Print segment of <string>")
+    parser.add_argument("-l", "--lib", default="", help="The path to the Dafny-EVM source code. Used to add includes files in the proof object.")
+    parser.add_argument("-c", "--cfg", type=int, default=0, help="Max depth. Control flow graph in DOT format")
+    parser.add_argument("-r", "--raw", action="store_true", help="Display non-minimised and minimised CFGs")
+    parser.add_argument("-f", "--fancy", action="store_true", help="Use exit and entry ports in segments do draw arrows.")
+    parser.add_argument("-n", "--notable", action="store_true", help="Don't use tables to pretty-print DOT file. Reduces size of the DOT file.")
+    parser.add_argument("-t", "--title", default="Name not set", help="The name of the program.")
+    parser.add_argument("-i", "--info", action="store_true", help="The stats of the program (size, segments).")
+    parser.add_argument("--abstract-stacks", action="store_true", help="Merge the states whose stacks only differ by values that are never jump targets")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Explore the functions of the dispatcher with JOBS processes (same CFG and stats as JOBS=1)")
+    parser.add_argument("--max-states", type=int, default=0, help="Stop the CFG exploration after this many states (partial CFG)")
+    parser.add_argument("--max-seconds", type=float, default=0, help="Stop the CFG exploration after this many seconds (partial CFG)")
+    parser.add_argument("--max-rss-mb", type=int, default=0, help="Stop the CFG exploration when the process uses this much memory (partial CFG)")
+    parser.add_argument("--reduce", action="store_true", help="Minimise the CFG during the exploration (same CFG)")
+    parser.add_argument("--checkpoint", metavar="FILE", help="Resume the CFG exploration from FILE and save it to FILE")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60, help="Save the checkpoint every this many seconds (0: at the end only)")
+    parser.add_argument("-o", "--output", default="-", help="Write the output to this file (- for stdout, compressed if it ends with .gz)")
+    parser.add_argument("--cache", metavar="FILE", help="Cache the CFGs in the SQLite file FILE")
+    parser.add_argument("--cache-mb", type=int, default=256, help="Max size of the cache in MB")
+    opts = parser.parse_args(argv)
+    if sum([opts.string is not None, opts.input is not None, opts.stdin]) != 1:
+        parser.error("exactly one of <string>, --input or --stdin is required")
+    if opts.binary and opts.string is not None:
+        parser.error("--binary applies to --input and --stdin only")
+    if opts.checkpoint is not None and opts.jobs > 1:
+        parser.error("--checkpoint and --jobs are exclusive")
+    if opts.reduce and opts.jobs > 1:
+        parser.error("--reduce and --jobs are exclusive")
+    if opts.reduce and opts.checkpoint is not None:
+        parser.error("--reduce and --checkpoint are exclusive")
+    if opts.reduce and opts.raw:
+        parser.error("--reduce builds the minimised CFG only, not with --raw")
+    # As Driver.Main, disassemble when no option is given (other than the
+    # input and output ones), and print nothing for options like -r alone.
+    inOut = {"string", "input", "stdin", "binary", "output"}
+    opts.bare = all(v == parser.get_default(k) for k, v in vars(opts).items() if k not in inOut)
+    return opts
+
+def Read(opts):
+    if opts.input is not None:
+        return InputReader.default__.ReadFile(opts.input, opts.binary)
+    if opts.stdin:
+        return InputReader.default__.ReadStdin(opts.binary)
+    return InputReader.default__.ReadString(opts.string)
+
+def BuildCFG(prog, maxDepth, minimise, abstract=False, jobs=1, budget=None, checkpoint=None, reduce=False):
+    """
+    The automaton and stats of prog.BuildCFG(maxDepth, minimise), with the
+    stacks abstracted if abstract (see StackAbstraction, the stats are then
+    StackAbstraction.Stats), the functions explored by jobs processes
+    (ParallelExplorer), the exploration stopped when budget is exceeded,
+    resumed from and saved to checkpoint (Checkpoint), or minimised during
+    the exploration if reduce (Reducer).
+    jobs > 1, checkpoint and reduce are exclusive, and reduce needs
+    minimise.
+    """
+    if sum([jobs > 1, checkpoint is not None, reduce]) > 1 or (reduce and not minimise):
+        raise ValueError("unsupported combination of exploration options")
+    projection = StackAbstraction.Projection(prog) if abstract else None
+    project = projection.Project if abstract else None
+    if jobs > 1:
+        a, stats = ParallelExplorer.default__.BuildCFG(prog, maxDepth, minimise, jobs, project, budget)
+    elif checkpoint is not None:
+        a, stats = Checkpoint.default__.BuildCFG(prog, maxDepth, minimise, checkpoint, project, budget)
+    elif reduce:
+        a, stats = Reducer.default__.BuildCFG(prog, maxDepth, project, budget)
+    else:
+        a, stats = Explorer.default__.BuildCFG(prog, maxDepth, minimise, project, budget)
+    if abstract:
+        stats = StackAbstraction.default__.Stats(stats, projection.merged)
+    return a, stats
+
+def Run(code, opts, out = None):
+    """
+    Same as the body of Driver.Main once the bytecode is decoded, written to
+    out (a sink, stdout by default). _dafny.print must write to out too.
+    """
+    if opts.dis or opts.bare:
+        Listing.default__.Write(itertools.chain(
+            ["Disassembled code:\n"],
+            Listing.default__.ScanLines(code),
+            ["--------------- Disassembled ---------------------\n"]), out)
+    if opts.bare:
+        return
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    y = prog.xs
+    if opts.info:
+        _dafny.print("-------- Program Stats ---------\n")
+        prog.PrintByteCodeInfo()
+        _dafny.print("-------- End Program Stats ---------\n")
+        _dafny.print("-------- Segment Stats ---------\n")
+        prog.PrintSegmentInfo()
+        _dafny.print("-------- End Segment Stats ---------\n")
+    if opts.segment:
+        Listing.default__.Write(itertools.chain(
+            ["Segments:\n"],
+            Listing.default__.SegmentLines(y),
+            ["----------------- Segments -------------------\n"]), out)
+    if opts.proof:
+        z = ProofObjectBuilder.default__.BuildProofObject(y)
+        _dafny.print("Dafny Proof Object:\n")
+        PrettyPrinters.default__.PrintProofObjectToDafny(z, ToSeq(opts.lib))
+        _dafny.print("----------------- Proof -------------------\n")
+    if opts.cfg > 0 and len(y) > 0 and y[0].StartAddress() == 0:
+        cache = None
+        if opts.cache is not None:
+            cache = ResultCache.ResultCache(opts.cache, opts.cache_mb * 1024 * 1024)
+        key = ResultCache.default__.Key(bytes(code), opts.cfg, not opts.raw, opts.notable, opts.fancy, opts.abstract_stacks)
+        budget = None
+        if opts.max_states > 0 or opts.max_seconds > 0 or opts.max_rss_mb > 0:
+            budget = Explorer.Budget(opts.max_states, opts.max_seconds, opts.max_rss_mb)
+        checkpoint = None
+        if opts.checkpoint is not None:
+            checkpoint = Checkpoint.Checkpoint(opts.checkpoint, Checkpoint.default__.Key(bytes(code), opts.cfg, not opts.raw, opts.abstract_stacks, opts.reduce), opts.checkpoint_seconds)
+        entry = ResultCache.default__.Entry(cache, key, prog, lambda: BuildCFG(prog, opts.cfg, not opts.raw, opts.abstract_stacks,
+            opts.jobs, budget, checkpoint, opts.reduce), checkpoint is None)
+        cfgObj = CFGObject.CFGObj_CFGObj(prog, opts.cfg, entry["auto"], not opts.raw, entry["stats"])
+        Listing.default__.Write([ResultCache.default__.Render(cache, key, entry, ("dot", opts.title),
+            lambda: Dot.default__.Lines(cfgObj, opts.notable, ToSeq(opts.title)))], out)
+
+def Main(argv):
+    Patches.default__.InstallAll()
+    opts = Options(argv)
+    code = Read(opts)
+    if code.is_Failure:
+        _dafny.print(code.msg.VerbatimString(False))
+        return 1
+    sink = Sink.default__.Open(opts.output)
+    try:
+        with Sink.default__.To(sink) as out:
+            Run(code.v, opts, out)
+    except Checkpoint.Mismatch as e:
+        _dafny.print(str(e) + "\n")
+        return 1
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(Main(sys.argv[1:]))
+    except _dafny.HaltException as e:
+        _dafny.print("[Program halted] " + e.message + "\n")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Tests of the Python modules (src/main/python) against the code generated
+# by Dafny (build/libs/driver-py, see compileToPy).
+# The modules are installed as in evmdis.py, and the generated functions
+# they replace are kept (GENERATED) so that a test can put them back (the
+# generated fixture).
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path[:0] = [os.path.join(ROOT, "src", "main", "python"), os.path.join(ROOT, "build", "libs", "driver-py")]
+
+import OpcodeDecoder
+import EVMToolTips
+import EVMObject
+import LinSegments
+import SegBuilder
+import GStateMinimiser
+import CFGStateAutomata
+import SeqOfSets
+import PartitionMod
+import State
+import CFGState
+import StackElement
+import InstructionStore
+import Patches
+
+# The classes patched by Install() -> their generated attributes.
+GENERATED = {cls: dict(vars(cls)) for cls in (
+    OpcodeDecoder.default__, EVMToolTips.default__, EVMObject.default__, EVMObject.EVMObj,
+    LinSegments.default__, LinSegments.LinSeg, SegBuilder.default__, GStateMinimiser.Pair,
+    CFGStateAutomata.Auto, SeqOfSets.default__, PartitionMod.default__, PartitionMod.Partition,
+    State.AState, State.AState_EState, CFGState.GState_EGState, StackElement.StackElem_Random)}
+
+Patches.default__.InstallAll()
+
+# Test contracts (hex files) of src/dafny/tests/src.
+CONTRACTS = [
+    "simple/simpleCall.bin",
+    "doubleLoop/doubleLoop.bin",
+    "nestedIntCall/nested.bin",
+    "fibonacci/fibo.bin",
+    "erc-20/erc-20.bin",
+    "rattle/Lottery/Lottery.bin",
+]
+
+def Code(name):
+    """
+    The bytecode of the test contract name.
+    """
+    with open(os.path.join(ROOT, "src", "dafny", "tests", "src", name)) as f:
+        return bytes.fromhex(f.read().strip())
+
+@pytest.fixture(params=CONTRACTS)
+def code(request):
+    return Code(request.param)
+
+@pytest.fixture
+def program():
+    """
+    The EVMObj of a hex string.
+    """
+    return lambda s: InstructionStore.default__.Build(bytes.fromhex(s)).EVMObj()
+
+@pytest.fixture
+def generated(monkeypatch):
+    """
+    Restore(cls, names...) puts back the generated attributes names of cls
+    for the test.
+    """
+    def Restore(cls, *names):
+        for name in names:
+            monkeypatch.setattr(cls, name, GENERATED[cls][name])
+    return Restore
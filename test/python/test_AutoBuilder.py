@@ -0,0 +1,55 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# AutoBuilder against Automata.Auto.AddState and AddEdge.
+import random
+
+import pytest
+
+import _dafny
+import Automata
+import AutoBuilder
+
+def Empty():
+    return Automata.Auto_Auto(_dafny.Map({}), _dafny.Map({}), _dafny.SeqWithoutIsStrInference([]), _dafny.Map({}))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random(seed):
+    rnd = random.Random(seed)
+    a = Empty()
+    b = AutoBuilder.AutoBuilder()
+    for _ in range(200):
+        s, t = rnd.randrange(40), rnd.randrange(40)
+        if rnd.random() < 0.2:
+            a = a.AddState(s)
+            b.AddState(s)
+        else:
+            a = a.AddEdge(s, t) if s in a.indexOf else a.AddState(s).AddEdge(s, t)
+            b.AddEdge(s, t)
+    assert b.Freeze() == a
+    assert b.SSize() == a.SSize() and b.TSize() == a.TSize(0)
+    for k in range(a.SSize()):
+        assert list(b.SuccNat(k)) == list(a.SuccNat(k))
+        assert list(b.PredNat(k)) == list(a.PredNat(k))
+        assert b.IndexOf(a.states[k]) == k
+
+def test_from_auto():
+    a = Empty().AddState(0).AddEdge(0, 1).AddEdge(1, 0).AddEdge(1, 2)
+    b = AutoBuilder.default__.FromAuto(a)
+    assert b.Freeze() == a
+    b.AddEdge(1, 0)
+    b.AddEdge(2, 3)
+    assert b.Freeze() == a.AddEdge(2, 3)
+    assert 3 in b and 4 not in b
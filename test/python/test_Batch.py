@@ -0,0 +1,72 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Batch: the records of a corpus, the results of a contract (as
+# Explorer.BuildCFG) and the limits of a contract.
+import json
+
+import pytest
+
+import InstructionStore
+import Explorer
+import Batch
+from conftest import CONTRACTS, Code
+
+@pytest.fixture
+def corpus(tmp_path):
+    d = tmp_path / "corpus"
+    d.mkdir()
+    for name in CONTRACTS:
+        (d / name.split("/")[-1]).write_text(Code(name).hex())
+    return d
+
+def Work(rid, payload, args):
+    Batch.default__.Init(None, 0)
+    return Batch.default__.Work(((rid, "hex", payload), Batch.Options(["-"] + args)))
+
+def test_records(tmp_path, corpus):
+    jsonl = tmp_path / "c.jsonl"
+    jsonl.write_text('{"id": "a", "bytecode": "6000"}\n\n{"code": "6001"}\n')
+    csv = tmp_path / "c.csv"
+    csv.write_text("id,bytecode\na,6000\nb,6001\n")
+    assert list(Batch.default__.Records(str(jsonl), False)) == [("a", "hex", "6000"), ("2", "hex", "6001")]
+    assert list(Batch.default__.Records(str(csv), False)) == [("a", "hex", "6000"), ("b", "hex", "6001")]
+    assert [r[0] for r in Batch.default__.Records(str(corpus), False)] == sorted(n.split("/")[-1] for n in CONTRACTS)
+
+def test_work(code):
+    r = Work("x", code.hex(), ["-c", "40"])
+    a, s = Explorer.default__.BuildCFG(InstructionStore.default__.Build(code).EVMObj(), 40, True)
+    assert r["status"] == "ok"
+    assert (r["states"], r["transitions"], r["visitedStates"]) == (a.SSize(), a.TSize(0), s.visitedStates)
+    assert "budget" not in r
+
+def test_error():
+    r = Work("x", "60zz", ["-c", "40"])
+    assert r["status"] == "error"
+    assert r["error"] == "String must be hexadecimal"
+
+def test_limits():
+    code = Code("erc-20/erc-20.bin").hex()
+    assert Work("x", code, ["-c", "100", "--timeout", "0.001"])["status"] == "timeout"
+    r = Work("x", code, ["-c", "100", "--max-rss-mb", "1"])
+    assert r["status"] == "ok"
+    assert r["budget"] == "max-rss-mb"
+
+def test_run(tmp_path, corpus):
+    out = tmp_path / "out.jsonl"
+    counts = Batch.default__.Run(Batch.Options([str(corpus), "-j", "1", "-c", "40", "-o", str(out), "--dot-dir", str(tmp_path / "dot")]))
+    assert counts["ok"] == len(CONTRACTS)
+    rs = [json.loads(l) for l in out.read_text().splitlines()]
+    assert all((tmp_path / "dot" / (r["id"] + ".dot")).exists() for r in rs)
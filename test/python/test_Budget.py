@@ -0,0 +1,51 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Explorer.Budget: the partial CFGs and the limit exceeded in the stats.
+import InstructionStore
+import Explorer
+from conftest import Code
+
+def Build(budget):
+    prog = InstructionStore.default__.Build(Code("erc-20/erc-20.bin")).EVMObj()
+    return Explorer.default__.BuildCFG(prog, 40, False, None, budget)
+
+def test_no_budget(code):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, s = Explorer.default__.BuildCFG(prog, 40, True, None, Explorer.Budget())
+    b, t = Explorer.default__.BuildCFG(prog, 40, True)
+    assert a == b
+    assert s == t
+    assert s.budget is None
+    assert "Budget" not in s.PrettyPrint().VerbatimString(False)
+
+def test_max_states():
+    a, s = Build(Explorer.Budget(10))
+    b, t = Build(None)
+    assert a.SSize() == 10 < b.SSize()
+    assert s.budget == "max-states"
+    assert s.maxDepthReached == t.maxDepthReached
+    assert s.PrettyPrint().VerbatimString(False).endswith("Budget exceeded:max-states\n")
+
+def test_max_seconds():
+    # The time is checked every Budget.CHECK steps.
+    a, s = Build(Explorer.Budget(0, 1e-9))
+    assert s.budget == "max-seconds"
+    assert a.SSize() <= Explorer.Budget.CHECK
+
+def test_minimise():
+    a, s = Explorer.default__.BuildCFG(InstructionStore.default__.Build(Code("erc-20/erc-20.bin")).EVMObj(), 40, True, None, Explorer.Budget(10))
+    assert s.budget == "max-states"
+    assert s.nonMinimisedSize[0] == 10
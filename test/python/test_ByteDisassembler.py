@@ -0,0 +1,53 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# ByteDisassembler and InstructionStore against BinaryDecoder.Disassemble
+# (with the generated OpcodeDecoder.Decode).
+import pytest
+
+import _dafny
+import OpcodeDecoder
+import BinaryDecoder
+import ByteDisassembler
+import InstructionStore
+
+# Malformed inputs: odd length, non hex digits, truncated PUSH arguments.
+MALFORMED = ["6", "60", "zz", "6001z", "61ff", "600160", "7f00", "600a6"]
+
+def Disassemble(s):
+    return BinaryDecoder.default__.Disassemble(_dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s)), _dafny.SeqWithoutIsStrInference([]), 0)
+
+@pytest.fixture(autouse=True)
+def decode(generated):
+    generated(OpcodeDecoder.default__, "Decode")
+
+def test_contracts(code):
+    s = code.hex()
+    p = Disassemble(s)
+    assert ByteDisassembler.default__.Disassemble(s) == p
+    assert ByteDisassembler.default__.Disassemble(code) == p
+    assert InstructionStore.default__.Build(code).ToSeq() == p
+
+@pytest.mark.parametrize("s", MALFORMED)
+def test_malformed(s):
+    p = Disassemble(s)
+    assert ByteDisassembler.default__.Disassemble(s) == p
+    assert InstructionStore.default__.Build(s).ToSeq() == p
+
+def test_case():
+    # The store reads the PUSH arguments from the bytes: always lowercase.
+    s = "5B5b60Ab"
+    assert ByteDisassembler.default__.Disassemble(s) == Disassemble(s)
+    assert InstructionStore.default__.Build(s).ToSeq() == Disassemble(s.lower())
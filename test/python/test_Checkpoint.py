@@ -0,0 +1,45 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Checkpoint.BuildCFG: a run stopped by a budget and resumed gives the CFG of
+# Explorer.BuildCFG.
+import pytest
+
+import InstructionStore
+import Explorer
+import Checkpoint
+
+def Build(prog, path, maxStates=0):
+    key = Checkpoint.default__.Key(b"code", 40, True, False, False)
+    budget = Explorer.Budget(maxStates) if maxStates > 0 else None
+    return Checkpoint.default__.BuildCFG(prog, 40, True, Checkpoint.Checkpoint(path, key, 0), None, budget)
+
+@pytest.mark.parametrize("maxStates", [1, 7, 30])
+def test_resume(code, tmp_path, maxStates):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    path = str(tmp_path / "ckpt")
+    Build(prog, path, maxStates)
+    a, s = Build(prog, path)
+    b, t = Explorer.default__.BuildCFG(prog, 40, True)
+    assert a == b
+    assert s == t
+
+def test_key(tmp_path):
+    prog = InstructionStore.default__.Build(bytes.fromhex("00")).EVMObj()
+    path = str(tmp_path / "ckpt")
+    Build(prog, path)
+    key = Checkpoint.default__.Key(b"code", 50, True, False, False)
+    with pytest.raises(Checkpoint.Mismatch):
+        Checkpoint.default__.BuildCFG(prog, 50, True, Checkpoint.Checkpoint(path, key, 0))
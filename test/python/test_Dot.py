@@ -0,0 +1,42 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Dot.Lines against CFGObj.ToDot.
+import pytest
+
+import _dafny
+import CFGObject
+import InstructionStore
+import Explorer
+import Dot
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+def Check(prog, minimise, noTable, capsys):
+    a, stats = Explorer.default__.BuildCFG(prog, 40, minimise)
+    cfg = CFGObject.CFGObj_CFGObj(prog, 40, a, minimise, stats)
+    capsys.readouterr()
+    cfg.ToDot(noTable, ToSeq("test"))
+    assert "".join(Dot.default__.Lines(cfg, noTable, ToSeq("test"))) == capsys.readouterr().out
+
+@pytest.mark.parametrize("minimise", [True, False])
+@pytest.mark.parametrize("noTable", [True, False])
+def test_contracts(code, minimise, noTable, capsys):
+    Check(InstructionStore.default__.Build(code).EVMObj(), minimise, noTable, capsys)
+
+def test_error_states(program, capsys):
+    # No wpre values with error states.
+    Check(program("600035600757565b60003556"), True, False, capsys)
@@ -0,0 +1,70 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Explorer against the generated (recursive) EVMObj.DFS and BuildCFG.
+import pytest
+
+import _dafny
+import Automata
+import CFGState
+import Statistics
+import EVMObject
+import InstructionStore
+import Explorer
+
+def Seq(xs):
+    return _dafny.SeqWithoutIsStrInference(xs)
+
+def NoStats():
+    return Statistics.Stats_Stats(False, 0, 0, 0, (0, 0))
+
+@pytest.mark.parametrize("minimise", [False, True])
+def test_contracts(code, minimise, generated):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, s = Explorer.default__.BuildCFG(prog, 40, minimise)
+    generated(EVMObject.EVMObj, "BuildCFG", "DFS")
+    assert prog.BuildCFG(40, minimise) == (a, s)
+
+def test_dfs(code, generated):
+    # From the first successor of the initial state.
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    init = CFGState.default__.DEFAULT__GSTATE
+    succ = prog.NextG(init)[0]
+    a = Automata.Auto_Auto(_dafny.Map({}), _dafny.Map({}), Seq([]), _dafny.Map({})).AddState(init).AddEdge(init, succ)
+    p = EVMObject.Path_Path(Seq([init, succ]), Seq([0]))
+    r = Explorer.default__.DFS(prog, p, a, 30, True, NoStats())
+    generated(EVMObject.EVMObj, "DFS")
+    assert prog.DFS(p, a, 30, True, NoStats()) == r
+
+def test_next_once(code, monkeypatch):
+    # NextG is computed once per explored state.
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    calls = []
+    nextG = EVMObject.EVMObj.NextG
+    def NextG(self, s):
+        calls.append(s)
+        return nextG(self, s)
+    monkeypatch.setattr(EVMObject.EVMObj, "NextG", NextG)
+    a, _ = Explorer.default__.BuildCFG(prog, 40, False)
+    assert len(calls) == len(set(calls)) <= a.SSize()
+
+def test_deep(generated):
+    # A path of 1500 segments (JUMPDEST): deeper than the recursion limit.
+    prog = InstructionStore.default__.Build(bytes.fromhex("5b" * 1500 + "00")).EVMObj()
+    a, s = Explorer.default__.BuildCFG(prog, 2000, False)
+    assert a.SSize() == 1500 and not s.maxDepthReached
+    generated(EVMObject.EVMObj, "BuildCFG", "DFS")
+    with pytest.raises(RecursionError):
+        prog.BuildCFG(2000, False)
@@ -0,0 +1,82 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# HashCons stacks against the generated stack operations of State.AState.
+import pickle
+import random
+
+import pytest
+
+import _dafny
+import State
+import CFGState
+import StackElement
+import HashCons
+from conftest import GENERATED
+
+def Value(v):
+    return StackElement.StackElem_Value(v)
+
+def Random():
+    return StackElement.StackElem_Random(_dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, "")))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_operations(seed):
+    rnd = random.Random(seed)
+    generated = GENERATED[State.AState]
+    s = State.AState_EState(0, _dafny.SeqWithoutIsStrInference([]))
+    for _ in range(300):
+        n = len(s.stack)
+        op = rnd.choice(["Push", "PushNRandom", "PopN", "Dup", "Swap", "Peek"])
+        if op == "Push":
+            args = (Value(rnd.randrange(4)),)
+        elif op == "PushNRandom":
+            args = (rnd.randrange(3),)
+        elif n == 0:
+            continue
+        elif op == "PopN":
+            args = (rnd.randrange(1, min(n, 3) + 1),)
+        elif op == "Dup":
+            args = (rnd.randrange(1, n + 1),)
+        elif op == "Swap":
+            if n < 2:
+                continue
+            args = (rnd.randrange(1, n),)
+        else:
+            args = (rnd.randrange(n),)
+        r = getattr(s, op)(*args)
+        g = generated[op](s, *args)
+        if op == "Peek":
+            assert r == g
+            continue
+        assert isinstance(r.stack, HashCons.Stack)
+        assert list(r.stack) == list(g.stack) and r.pc == g.pc
+        assert r == g and hash(r) == hash(g)
+        s = r
+
+def test_interned():
+    a = HashCons.Cons(Value(1), HashCons.Cons(Value(2), HashCons.Stack.EMPTY))
+    b = HashCons.default__.FromSeq(_dafny.SeqWithoutIsStrInference([Value(1), Value(2)]))
+    assert a is b
+    g = CFGState.GState_EGState(3, _dafny.SeqWithoutIsStrInference([Value(1), Value(2)]))
+    assert g.st is a
+    assert hash(g) == hash(CFGState.GState_EGState(3, a))
+    assert a[1:] is a.rest and a[1] == Value(2)
+    assert Random() is HashCons.RANDOM
+
+def test_pickle():
+    g = CFGState.GState_EGState(3, _dafny.SeqWithoutIsStrInference([Value(1), Random()]))
+    h = pickle.loads(pickle.dumps(g))
+    assert h == g and h.st is g.st
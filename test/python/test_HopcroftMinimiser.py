@@ -0,0 +1,28 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# HopcroftMinimiser against GStateMinimiser.Pair.Minimise (EVMObj.BuildCFG).
+import EVMObject
+import GStateMinimiser
+import InstructionStore
+import Explorer
+
+def test_contracts(code, generated):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    r = Explorer.default__.BuildCFG(prog, 40, True)
+    generated(EVMObject.EVMObj, "BuildCFG")
+    assert prog.BuildCFG(40, True) == r
+    generated(GStateMinimiser.Pair, "Minimise")
+    assert prog.BuildCFG(40, True) == r
@@ -0,0 +1,57 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# InstructionStore: the EVMObj as built by Driver.Main and the lazy views.
+import _dafny
+import EVMObject
+import Splitter
+import InstructionStore
+
+def Seq(xs):
+    return _dafny.SeqWithoutIsStrInference(xs)
+
+def test_evmobj(code, generated):
+    store = InstructionStore.default__.Build(code)
+    prog = store.EVMObj()
+    generated(EVMObject.default__, "CollectJumpDests", "CollectThem")
+    y = Splitter.default__.SplitUpToTerminal(Seq(list(store.ToSeq())), Seq([]), Seq([]))
+    assert prog.xs == y
+    assert prog.jumpDests == EVMObject.default__.CollectJumpDests(y)
+    assert prog.PCToSegMap == EVMObject.default__.CollectThem(y)
+
+def test_inputs(code):
+    s = InstructionStore.default__.Build(code).ToSeq()
+    assert InstructionStore.default__.Build(bytearray(code)).ToSeq() == s
+    assert InstructionStore.default__.Build(memoryview(code)).ToSeq() == s
+    assert InstructionStore.default__.Build(code.hex()).ToSeq() == s
+
+def test_lazy():
+    # PUSH2 0x0102 JUMPDEST PUSH1 0xff STOP
+    store = InstructionStore.default__.Build("6101025b60ff00")
+    r = store.ToSeq()
+    assert len(r) == 4
+    assert r[2].arg == Seq(map(_dafny.CodePoint, "ff"))
+    assert r[1:3][0].address == 3
+    assert r._elems is None
+    assert [i.address for i in r] == [0, 3, 4, 6]
+    assert r._elems is None
+    assert list(r.elems) == list(r)
+    assert [store.Immediate(i) for i in range(4)] == [0x0102, None, 0xff, None]
+
+def test_tail():
+    # A truncated PUSH2 is an INVALID instruction with the rest as argument.
+    store = InstructionStore.default__.Build("6001610a")
+    assert store.IsTail(1) and store.Immediate(1) is None
+    assert store[1].address == 2
@@ -0,0 +1,32 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# JumpTable against EVMObject.CollectJumpDests and CollectThem.
+import EVMObject
+import LinSegments
+import InstructionStore
+import JumpTable
+
+def test_contracts(code, generated):
+    generated(LinSegments.LinSeg, "Ins")
+    xs = InstructionStore.default__.Build(code).Segments()
+    jumpDests = JumpTable.default__.CollectJumpDests(xs)
+    pcToSeg = JumpTable.default__.CollectThem(xs)
+    generated(EVMObject.default__, "CollectJumpDests", "CollectThem")
+    expected = EVMObject.default__.CollectJumpDests(xs)
+    assert jumpDests == expected
+    assert pcToSeg == EVMObject.default__.CollectThem(xs)
+    for pc in list(range(-1, len(code) + 2)) + [1 << 256, None]:
+        assert (pc in jumpDests) == (pc in expected.Elements)
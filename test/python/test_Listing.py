@@ -0,0 +1,50 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Listing against PrettyPrinters.PrintInstructions and PrintSegments.
+import io
+
+import PrettyPrinters
+import ByteDisassembler
+import InstructionStore
+import Listing
+
+def test_instructions(code, capsys):
+    xs = ByteDisassembler.default__.Disassemble(code)
+    capsys.readouterr()
+    PrettyPrinters.default__.PrintInstructions(xs)
+    out = capsys.readouterr().out
+    assert "".join(Listing.default__.InstructionLines(xs)) == out
+    assert "".join(Listing.default__.ScanLines(code)) == out
+
+def test_segments(code, capsys):
+    xs = InstructionStore.default__.Build(code).EVMObj().xs
+    capsys.readouterr()
+    PrettyPrinters.default__.PrintSegments(xs, 3)
+    assert "".join(Listing.default__.SegmentLines(xs, 3)) == capsys.readouterr().out
+
+def test_invalid(capsys):
+    # An unknown opcode and a truncated PUSH2.
+    code = bytes.fromhex("600c0c61ff")
+    xs = ByteDisassembler.default__.Disassemble(code)
+    capsys.readouterr()
+    PrettyPrinters.default__.PrintInstructions(xs)
+    assert "".join(Listing.default__.ScanLines(code)) == capsys.readouterr().out
+
+def test_write():
+    lines = ["%d\n" % k for k in range(10)]
+    out = io.StringIO()
+    Listing.default__.Write(iter(lines), out, 3)
+    assert out.getvalue() == "".join(lines)
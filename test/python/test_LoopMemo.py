@@ -0,0 +1,36 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# LoopMemo against EVMObj.SafeLoopFound (the generated DFS and loop checks),
+# and the loop checks counted in the stats of each exploration.
+import EVMObject
+import InstructionStore
+import Explorer
+from conftest import Code
+
+def test_contracts(code, generated):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, s = Explorer.default__.BuildCFG(prog, 20, True)
+    generated(EVMObject.EVMObj, "BuildCFG", "DFS", "SafeLoopFound")
+    assert prog.BuildCFG(20, True) == (a, s)
+
+def test_counters():
+    prog = InstructionStore.default__.Build(Code("fibonacci/fibo.bin")).EVMObj()
+    _, s = Explorer.default__.BuildCFG(prog, 40, True)
+    assert s.loopMisses > 0
+    # The tables are kept for the program: all the checks are found.
+    _, t = Explorer.default__.BuildCFG(prog, 40, True)
+    assert t.loopHits == s.loopHits + s.loopMisses
+    assert t.loopMisses == 0
@@ -0,0 +1,53 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# ParallelExplorer.BuildCFG (--jobs) against the serial Explorer.BuildCFG.
+import pytest
+
+import InstructionStore
+import Explorer
+import StackAbstraction
+import ParallelExplorer
+from conftest import Code
+
+# Contracts with a dispatcher.
+DISPATCHERS = ["erc-20/erc-20.bin", "fibonacci/fibo.bin", "rattle/Lottery/Lottery.bin"]
+
+@pytest.mark.parametrize("name", DISPATCHERS)
+@pytest.mark.parametrize("minimise", [False, True])
+def test_serial(name, minimise):
+    prog = InstructionStore.default__.Build(Code(name)).EVMObj()
+    a, s = ParallelExplorer.default__.BuildCFG(prog, 40, minimise, 2)
+    b, t = Explorer.default__.BuildCFG(prog, 40, minimise)
+    assert a == b
+    assert s == t
+    assert s.nonMinimisedSize == t.nonMinimisedSize
+
+def test_abstract():
+    prog = InstructionStore.default__.Build(Code("erc-20/erc-20.bin")).EVMObj()
+    p1 = StackAbstraction.Projection(prog)
+    p2 = StackAbstraction.Projection(prog)
+    a, s = ParallelExplorer.default__.BuildCFG(prog, 40, False, 2, p1.Project)
+    b, t = Explorer.default__.BuildCFG(prog, 40, False, p2.Project)
+    assert a == b
+    assert s == t
+    assert p1.merged == p2.merged
+
+def test_budget():
+    prog = InstructionStore.default__.Build(Code("erc-20/erc-20.bin")).EVMObj()
+    a, s = ParallelExplorer.default__.BuildCFG(prog, 40, False, 2, None, Explorer.Budget(maxStates=10))
+    b, t = Explorer.default__.BuildCFG(prog, 40, False, None, Explorer.Budget(maxStates=10))
+    assert a == b
+    assert s.budget == t.budget == "max-states"
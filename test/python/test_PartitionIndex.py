@@ -0,0 +1,61 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# PartitionIndex against the Partition methods of PartitionMod.
+import pytest
+
+import _dafny
+import EVMObject
+import GStateMinimiser
+import PartitionMod
+import SeqOfSets
+import InstructionStore
+import Explorer
+import PartitionIndex
+
+def test_contracts(code, generated):
+    # The generated minimisation, with the partitions of PartitionIndex.
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    generated(EVMObject.EVMObj, "BuildCFG")
+    generated(GStateMinimiser.Pair, "Minimise")
+    r = prog.BuildCFG(40, True)
+    generated(PartitionMod.Partition, "SplitIn2", "ComputeFinest", "RefineAll", "GetClass", "GetClassRepOf", "GetClassRepOfSeqs")
+    generated(PartitionMod.default__, "MakeInit")
+    generated(SeqOfSets.default__, "SetToSequence")
+    assert prog.BuildCFG(40, True) == r
+
+def test_split(generated):
+    xs = [9, 2, 7, 4, 3, 8, 1]
+    equiv = lambda x, y: x % 3 == y % 3
+    r = PartitionIndex.default__.Split(sorted(xs), equiv)
+    generated(SeqOfSets.default__, "SetToSequence")
+    expected = PartitionMod.default__.SplitTrueAndFalse(_dafny.Set(xs), equiv, len(xs))
+    assert r == [sorted(c) for c in expected]
+    assert PartitionIndex.default__.Split([], equiv) == []
+
+def test_signature(code):
+    # The classes of the successors as a signature, or pairwise.
+    a, _ = Explorer.default__.BuildCFG(InstructionStore.default__.Build(code).EVMObj(), 40, False)
+    pair = GStateMinimiser.Pair_Pair(a, PartitionMod.default__.MakeInit(a.SSize()))
+    xs = list(range(a.SSize()))
+    assert PartitionIndex.default__.Signature(pair.Splitter) is not None
+    assert PartitionIndex.default__.Split(xs, pair.Splitter) == PartitionIndex.default__.Split(xs, lambda x, y: pair.Splitter(x, y))
+
+def test_get_class():
+    p = PartitionIndex.default__.Make(4, [[0, 2], [1, 3]])
+    assert PartitionIndex.default__.GetClass(p, 3, 0) == 1
+    assert PartitionIndex.default__.GetClass(p, 3, 1) == 1
+    with pytest.raises(IndexError):
+        PartitionIndex.default__.GetClass(p, 0, 1)
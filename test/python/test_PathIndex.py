@@ -0,0 +1,57 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# PathIndex.Path against the Seqs of EVMObject.Path and
+# EVMObj.FindFirstNodeWithSegIndex.
+import random
+
+import pytest
+
+import _dafny
+import CFGState
+import PathIndex
+
+def State(n):
+    return CFGState.GState_EGState(n, _dafny.SeqWithoutIsStrInference([]))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random(seed, program):
+    rnd = random.Random(seed)
+    prog = program("00")
+    path = PathIndex.Path([State(0)], [])
+    states, exits = [State(0)], []
+    for _ in range(300):
+        if len(states) > 1 and rnd.random() < 0.4:
+            assert path.Pop() == states.pop()
+            exits.pop()
+        else:
+            s, e = State(rnd.randrange(5)), rnd.randrange(2)
+            path.Push(s, e)
+            states.append(s)
+            exits.append(e)
+        assert path.states == states and path.exits == exits and len(path) == len(states)
+        gs = _dafny.SeqWithoutIsStrInference(states)
+        for n in range(5):
+            ps = [k for k, s in enumerate(states) if s.segNum == n]
+            assert path.Positions(n) == ps
+            first = prog.FindFirstNodeWithSegIndex(n, gs, 0)
+            assert (first.v if first.is_Some else None) == (ps[0] if ps else None)
+
+def test_init():
+    states = [State(1), State(2), State(1)]
+    path = PathIndex.Path(_dafny.SeqWithoutIsStrInference(states), _dafny.SeqWithoutIsStrInference([0, 1]))
+    assert path.states == states and path.exits == [0, 1]
+    assert path.Positions(1) == [0, 2] and path.Positions(3) == []
+    assert path.Last() == State(1)
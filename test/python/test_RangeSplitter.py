@@ -0,0 +1,31 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# RangeSplitter.Split against Splitter.SplitUpToTerminal.
+import _dafny
+import Splitter
+import InstructionStore
+import RangeSplitter
+
+def test_contracts(code):
+    store = InstructionStore.default__.Build(code)
+    xs = Splitter.default__.SplitUpToTerminal(_dafny.SeqWithoutIsStrInference(list(store.ToSeq())), _dafny.SeqWithoutIsStrInference([]), _dafny.SeqWithoutIsStrInference([]))
+    assert RangeSplitter.default__.Split(store) == xs
+
+def test_malformed():
+    # A truncated PUSH ends with an INVALID instruction.
+    store = InstructionStore.default__.Build("5b6001565b61ff")
+    xs = Splitter.default__.SplitUpToTerminal(_dafny.SeqWithoutIsStrInference(list(store.ToSeq())), _dafny.SeqWithoutIsStrInference([]), _dafny.SeqWithoutIsStrInference([]))
+    assert RangeSplitter.default__.Split(store) == xs
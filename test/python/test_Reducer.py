@@ -0,0 +1,58 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+# Reducer.BuildCFG (--reduce) against Explorer.Minimise of the whole automaton.
+import _dafny
+import CFGState
+import Statistics
+import EVMObject
+import InstructionStore
+import Explorer
+import Reducer
+from conftest import Code
+
+def Minimised(prog, maxDepth):
+    a1, s1 = Explorer.default__.BuildCFG(prog, maxDepth, False)
+    return Explorer.default__.Minimise(a1, s1)
+
+def test_contracts(code):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, s = Reducer.default__.BuildCFG(prog, 40)
+    b, t = Minimised(prog, 40)
+    assert a == b
+    assert s == t
+
+def test_error_states(program):
+    # Two jumps to the calldata: two different error states.
+    prog = program("600035600757565b60003556")
+    a, _ = Reducer.default__.BuildCFG(prog, 10)
+    b, _ = Minimised(prog, 10)
+    assert a.SSize() == 5
+    assert a == b
+
+def test_retained():
+    # A looping contract: the visited states are all kept (one id each),
+    # the successors and states of the complete SCCs are not.
+    prog = InstructionStore.default__.Build(Code("fibonacci/fibo.bin")).EVMObj()
+    init = CFGState.default__.DEFAULT__GSTATE
+    r = Reducer.Reducer()
+    r.AddState(init)
+    p0 = EVMObject.Path_Path(_dafny.SeqWithoutIsStrInference([init]), _dafny.SeqWithoutIsStrInference([]))
+    s = Explorer.default__.Explore(prog, p0, r, 40, Statistics.Stats_Stats(False, 0, 0, 0, (0, 0)))
+    assert s.wPreInvSuccess > 0
+    a = r.Freeze()
+    b, t = Minimised(prog, 40)
+    assert len(r.ids) == r.SSize() == t.nonMinimisedSize[0]
+    assert len(r.repStates) == a.SSize() < r.SSize()
+    assert not r.succs and not r.states and not r.open
@@ -0,0 +1,89 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# ResultCache: the entries are built once, partial CFGs are not stored and
+# the least recently used entries are evicted.
+import os
+
+import pytest
+
+import InstructionStore
+import Explorer
+import ResultCache
+import evmdis
+from conftest import Code
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResultCache.ResultCache(str(tmp_path / "cache.db"), 1 << 20)
+    yield c
+    c.Close()
+
+def Builder(prog, budget=None):
+    calls = []
+    def Build():
+        calls.append(1)
+        return Explorer.default__.BuildCFG(prog, 40, True, None, budget)
+    return Build, calls
+
+def test_entry(cache, code):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    key = ResultCache.default__.Key(code, 40, True, False, False)
+    build, calls = Builder(prog)
+    e1 = ResultCache.default__.Entry(cache, key, prog, build)
+    e2 = ResultCache.default__.Entry(cache, key, prog, build)
+    assert len(calls) == 1
+    assert (e2["auto"], e2["stats"]) == Explorer.default__.BuildCFG(prog, 40, True)
+    assert e2["segments"] == prog.xs
+    assert cache.Stats()["hits"] == 1
+
+def test_partial(cache):
+    code = Code("erc-20/erc-20.bin")
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    key = ResultCache.default__.Key(code, 40, True, False, False)
+    build, calls = Builder(prog, Explorer.Budget(5))
+    ResultCache.default__.Entry(cache, key, prog, build)
+    ResultCache.default__.Entry(cache, key, prog, Builder(prog)[0], False)
+    assert key not in cache
+    ResultCache.default__.Entry(cache, key, prog, build)
+    assert len(calls) == 2
+
+def test_render(cache):
+    code = Code("fibonacci/fibo.bin")
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    key = ResultCache.default__.Key(code, 40, True, False, False)
+    entry = ResultCache.default__.Entry(cache, key, prog, Builder(prog)[0])
+    assert ResultCache.default__.Render(cache, key, entry, "x", lambda: ["a", "b"]) == "ab"
+    entry = ResultCache.default__.Entry(cache, key, prog, None)
+    assert ResultCache.default__.Render(cache, key, entry, "x", None) == "ab"
+
+def test_evict(tmp_path):
+    # Values of about 1000 bytes (compressed): three of them fit.
+    cache = ResultCache.ResultCache(str(tmp_path / "cache.db"), 3500)
+    for k in "abc":
+        cache.Put(k, os.urandom(1000))
+    cache.Get("a")
+    cache.Put("d", os.urandom(1000))
+    assert "a" in cache and "b" not in cache
+    assert cache.Stats()["evictions"] >= 1
+    cache.Close()
+
+def test_options():
+    prog = InstructionStore.default__.Build(Code("fibonacci/fibo.bin")).EVMObj()
+    with pytest.raises(ValueError):
+        evmdis.BuildCFG(prog, 40, False, reduce=True)
+    for args in [["-j", "2", "--reduce"], ["--checkpoint", "f", "--reduce"], ["-r", "--reduce"], ["-j", "2", "--checkpoint", "f"]]:
+        with pytest.raises(SystemExit):
+            evmdis.Options(args + ["6000"])
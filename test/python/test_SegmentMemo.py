@@ -0,0 +1,65 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# SegmentMemo against the generated functions it memoises.
+import _dafny
+import LinSegments
+import SegBuilder
+import Splitter
+import InstructionStore
+import SegmentMemo
+
+def Segments(code):
+    store = InstructionStore.default__.Build(code)
+    seq = _dafny.SeqWithoutIsStrInference
+    # The segments of the store (InstructionRange) and of a Seq of Instructions.
+    return list(store.Segments()) + list(Splitter.default__.SplitUpToTerminal(seq(list(store.ToSeq())), seq([]), seq([])))
+
+def test_contracts(code):
+    for s in Segments(code):
+        ins = SegmentMemo.GeneratedIns(s)
+        assert s.Ins() == ins
+        for k in range(3):
+            assert s.WeakestPreOperands(s.Ins(), k) == SegmentMemo.GeneratedWeakestPreOperands(s, ins, k)
+            assert s.WeakestPreCapacity(k) == SegmentMemo.GeneratedWeakestPreCapacity(s, k)
+        assert s.WeakestPreOperands(s.ins, 1) == SegmentMemo.GeneratedWeakestPreOperands(s, s.ins, 1)
+        if s.is_JUMPSeg or s.is_JUMPISeg:
+            assert SegBuilder.default__.JUMPResolver(s) == SegmentMemo.GeneratedJUMPResolver(s)
+
+def test_equiv():
+    # PUSH1 1 PUSH1 2 ADD STOP at 0 and at 1 (after a STOP) are EquivSeg,
+    # and PUSH1 3 PUSH1 4 ADD STOP has the same opcodes: the others find
+    # the weakest precondition of the first.
+    a = InstructionStore.default__.Build("600160020100").Segments()[0]
+    b = InstructionStore.default__.Build("00600160020100").Segments()[1]
+    c = InstructionStore.default__.Build("600360040100").Segments()[0]
+    assert LinSegments.default__.EquivSeg(a, b)
+    a.WeakestPreOperands(a.Ins(), 7)
+    hits = SegmentMemo.WPRE_OPERANDS.hits
+    for s in (b, c):
+        assert s.WeakestPreOperands(s.Ins(), 7) == SegmentMemo.GeneratedWeakestPreOperands(s, s.Ins(), 7)
+    assert SegmentMemo.WPRE_OPERANDS.hits == hits + 2
+
+def test_memo():
+    m = SegmentMemo.Memo("test", 2)
+    c = SegmentMemo.Counter()
+    assert m.Get(1, lambda: "a", c) == "a"
+    assert m.Get(2, lambda: "b", c) == "b"
+    assert m.Get(1, lambda: "x", c) == "a"
+    # 2 is the least recently used.
+    m.Get(3, lambda: "c", c)
+    assert list(m.table) == [1, 3]
+    assert (c.hits, c.misses) == (1, 3)
+    assert m.Stats() == {"hits": 1, "misses": 3, "size": 2, "hitRate": 0.25}
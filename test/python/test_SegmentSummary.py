@@ -0,0 +1,61 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# SegmentSummary.RunIns against the generated LinSegments.RunIns.
+import random
+
+import _dafny
+import State
+import StackElement
+import LinSegments
+import InstructionStore
+import Explorer
+import HashCons
+import SegmentSummary
+
+def Stacks(rnd, prog, n):
+    """
+    n random stacks of Values (jump destinations and small numbers) and
+    unknown elements.
+    """
+    values = list(prog.jumpDests) + [0, 1, 2, 2 ** 256 - 1]
+    for _ in range(n):
+        yield _dafny.SeqWithoutIsStrInference([HashCons.RANDOM if rnd.random() < 0.3 else StackElement.StackElem_Value(rnd.choice(values))
+            for _ in range(rnd.randrange(12))])
+
+def test_contracts(code):
+    rnd = random.Random(0)
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    for seg in prog.xs:
+        for st in Stacks(rnd, prog, 5):
+            s = State.AState_EState(seg.StartAddress(), st)
+            assert SegmentSummary.default__.RunIns(seg.ins, s, prog.jumpDests) == SegmentSummary.GeneratedRunIns(seg.ins, s, prog.jumpDests)
+
+def test_next(code, generated):
+    # The successors of the states of the CFG.
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, _ = Explorer.default__.BuildCFG(prog, 40, False)
+    succs = [prog.NextG(s) for s in a.states]
+    generated(LinSegments.default__, "RunIns")
+    assert [prog.NextG(s) for s in a.states] == succs
+
+def test_small_stack():
+    # ADD on a stack of one element: smaller than the min size of the
+    # summary, run by the generated RunIns.
+    prog = InstructionStore.default__.Build("60010100").EVMObj()
+    xs = prog.xs[0].ins
+    assert SegmentSummary.default__.Get(xs, prog.jumpDests).need == 1
+    s = State.AState_EState(0, _dafny.SeqWithoutIsStrInference([]))
+    assert SegmentSummary.default__.RunIns(xs, s, prog.jumpDests) == SegmentSummary.GeneratedRunIns(xs, s, prog.jumpDests)
@@ -0,0 +1,67 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# Sink: the output of evmdis.py written to files, and the sinks.
+import io
+import gzip
+
+import pytest
+
+import _dafny
+import evmdis
+import Sink
+from conftest import CONTRACTS, Code
+
+@pytest.mark.parametrize("name", CONTRACTS[:4])
+@pytest.mark.parametrize("ext", ["txt", "txt.gz"])
+def test_output(capsys, tmp_path, name, ext):
+    # -o FILE (gzip for .gz) gets the same output as stdout: the lines of
+    # the renderers and the _dafny.print of the generated printers, in order.
+    args = ["-d", "-s", "-i", "-c", "40", Code(name).hex()]
+    evmdis.Main(args)
+    out = capsys.readouterr().out
+    path = str(tmp_path / ("out." + ext))
+    evmdis.Main(["-o", path] + args)
+    assert capsys.readouterr().out == ""
+    with (gzip.open(path, "rt") if ext.endswith(".gz") else open(path)) as f:
+        assert f.read() == out
+
+def test_to():
+    out = io.StringIO()
+    with Sink.default__.To(out) as b:
+        _dafny.print("a")
+        b.write("b\n")
+        _dafny.print(_dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, "c")).VerbatimString(False))
+        assert out.getvalue() == ""
+    assert out.getvalue() == "ab\nc"
+    assert _dafny.print is not b.Print
+
+def test_buffer():
+    out = io.StringIO()
+    b = Sink.Buffer(out, 4)
+    b.write("ab")
+    assert out.getvalue() == ""
+    b.write("cd")
+    assert out.getvalue() == "abcd"
+
+def test_sinks():
+    assert Sink.default__.Open(None).write("abc") == 3
+    raw = io.BytesIO()
+    t = Sink.default__.Text(raw)
+    t.write("é")
+    t.flush()
+    assert raw.getvalue() == "é".encode()
+    s = io.StringIO()
+    assert Sink.default__.Text(s) is s
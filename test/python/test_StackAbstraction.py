@@ -0,0 +1,64 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# StackAbstraction: the minimised CFG with the projection is the same as
+# without it, and the dead positions of the stacks are projected.
+import _dafny
+import CFGState
+import StackElement
+import InstructionStore
+import Explorer
+import HashCons
+import StackAbstraction
+import evmdis
+
+def Shape(a):
+    """
+    The segments and successors of the states of a.
+    """
+    return [(s.segNum if s.is_EGState else None, list(a.SuccNat(k))) for k, s in enumerate(a.states)]
+
+def test_contracts(code):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    p = StackAbstraction.Projection(prog)
+    a, s = Explorer.default__.BuildCFG(prog, 100, True, p.Project)
+    b, t = Explorer.default__.BuildCFG(prog, 100, True)
+    assert not s.maxDepthReached
+    assert Shape(a) == Shape(b)
+    assert s.nonMinimisedSize[0] == t.nonMinimisedSize[0] - p.merged
+
+def test_merged(code):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, s = evmdis.BuildCFG(prog, 100, False, True)
+    b, t = Explorer.default__.BuildCFG(prog, 100, False)
+    assert isinstance(s, StackAbstraction.Stats)
+    assert a.SSize() == b.SSize() - s.mergedStates
+    assert "Merged states:%d\n" % s.mergedStates in s.PrettyPrint().VerbatimString(False)
+
+def test_projection(program):
+    # JUMPDEST SWAP1 POP JUMP | JUMPDEST STOP
+    prog = program("5b9050565b00")
+    k, l = prog.PCToSegMap[0], prog.PCToSegMap[4]
+    p = StackAbstraction.Projection(prog)
+    v = [StackElement.StackElem_Value(n) for n in (1, 2, 3)]
+    st = _dafny.SeqWithoutIsStrInference
+    r = HashCons.RANDOM
+    # k jumps to the top of the stack and leaves the positions from 2 to
+    # an unknown successor: position 1 is dead. Nothing is live in l.
+    assert p.Project(CFGState.GState_EGState(k, st(v))) == CFGState.GState_EGState(k, st([v[0], r, v[2]]))
+    assert p.Project(CFGState.GState_EGState(l, st(v))) == CFGState.GState_EGState(l, st([r, r, r]))
+    assert p.merged == 0
+    p.Project(CFGState.GState_EGState(k, st([v[0], v[0], v[2]])))
+    assert p.merged == 1
@@ -0,0 +1,58 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# WPreFix against EVMObj.Fix, EVMObj.ComputeWPreOperands and Auto.Fix2.
+import pytest
+
+import _dafny
+import EVMObject
+import CFGStateAutomata
+import InstructionStore
+import Explorer
+import WPreFix
+
+@pytest.mark.parametrize("minimise", [True, False])
+def test_contracts(code, minimise, generated):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, _ = Explorer.default__.BuildCFG(prog, 40, minimise)
+    assert prog.HasNoErrorState(a)
+    xs = prog.xs
+    wpre0 = _dafny.SeqWithoutIsStrInference([xs[s.segNum].WeakestPreOperands(xs[s.segNum].Ins(), 0) for s in a.states])
+    r = WPreFix.default__.ComputeWPreOperands(prog, a)
+    # The first rounds (the fixpoint is not reached).
+    rounds = [WPreFix.default__.Fix(prog, a, wpre0, range(len(wpre0)), wpre0, k) for k in range(3)]
+    generated(EVMObject.EVMObj, "Fix", "ComputeWPreOperands")
+    assert prog.ComputeWPreOperands(a) == r
+    assert [prog.Fix(a, wpre0, _dafny.Set(range(len(wpre0))), wpre0, k) for k in range(3)] == rounds
+
+def test_fix2(code, generated):
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, _ = Explorer.default__.BuildCFG(prog, 40, True)
+    b = CFGStateAutomata.Auto_Auto(a.transitionsNat, a.revTransitionsNat, a.states, a.indexOf)
+    # The distance to an exit, up to 8.
+    f = lambda i, xs: min(8, 1 + max((xs[j] for j in a.SuccNat(i)), default=-1))
+    xs0 = [0] * len(a.states)
+    r = [b.Fix2(set(range(len(xs0))), xs0, k, f) for k in (0, 1, 2, 20)]
+    generated(CFGStateAutomata.Auto, "Fix2")
+    assert [b.Fix2(set(range(len(xs0))), xs0, k, f) for k in (0, 1, 2, 20)] == r
+
+def test_updates(code):
+    # Each round updates the states scheduled by the previous one.
+    prog = InstructionStore.default__.Build(code).EVMObj()
+    a, _ = Explorer.default__.BuildCFG(prog, 40, True)
+    r = WPreFix.default__.ComputeWPreOperands(prog, a)
+    assert r.is_Left
+    assert r.updates >= len(a.states)
+    assert WPreFix.default__.ComputeWPreOperands(prog, a).updates == r.updates
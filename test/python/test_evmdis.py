@@ -0,0 +1,73 @@
+#
+# Copyright 2023 Franck Cassez
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software dis-
+# tributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+# evmdis.py (and InputReader) against Driver.Main.
+import pytest
+
+import _dafny
+import Driver
+import InputReader
+import evmdis
+from conftest import CONTRACTS, Code
+
+# The generated Driver.Main disassembles in quadratic time: small contracts only.
+SMALL = CONTRACTS[:4]
+
+def ToSeq(s):
+    return _dafny.SeqWithoutIsStrInference(map(_dafny.CodePoint, s))
+
+def Generated(capsys, args):
+    Driver.default__.Main(_dafny.SeqWithoutIsStrInference([ToSeq(a) for a in ["evmdis"] + args]))
+    return capsys.readouterr().out
+
+def Main(capsys, args):
+    evmdis.Main(args)
+    return capsys.readouterr().out
+
+@pytest.mark.parametrize("name", SMALL)
+@pytest.mark.parametrize("opts", [[], ["-d"], ["-s"], ["-i"], ["-c", "40"], ["-c", "40", "-r", "-n"], ["-r"]])
+def test_contracts(capsys, name, opts):
+    s = Code(name).hex()
+    assert Main(capsys, opts + [s]) == Generated(capsys, opts + [s])
+
+@pytest.mark.parametrize("s", ["zz", "0x6000", "6001600201", "-d 600", "-c 3 6x"])
+def test_strings(capsys, s):
+    args = s.split()
+    assert Main(capsys, args) == Generated(capsys, args)
+
+def test_input(capsys, code, tmp_path):
+    f = tmp_path / "code.bin"
+    f.write_text("0x" + code.hex() + "\n")
+    g = tmp_path / "code.raw"
+    g.write_bytes(code)
+    out = Main(capsys, ["-d", code.hex()])
+    assert Main(capsys, ["-d", "--input", str(f)]) == out
+    assert Main(capsys, ["-d", "-b", "--input", str(g)]) == out
+
+@pytest.mark.parametrize("args, bare", [
+    (["6000"], True),
+    (["-ofile", "6000"], True),
+    (["-o", "6000", "6000"], True),
+    (["--input", "f", "-bi"], False),
+    (["-r", "6000"], False),
+    (["-c5", "6000"], False),
+])
+def test_bare(args, bare):
+    assert evmdis.Options(args).bare == bare
+
+def test_read():
+    assert InputReader.default__.ReadString(" 0x6000\n").v == bytes.fromhex("6000")
+    for s in ["", "600", "60zz", "é0"]:
+        assert InputReader.default__.ReadString(s).is_Failure